@@ -2,13 +2,16 @@
 Automation Hub - Main Window & UI Shell
 PySide6 Desktop Application with Custom Title Bar
 """
+import logging
 import sys
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
-                               QHBoxLayout, QPushButton, QLabel, QStackedWidget, QFrame)
-from PySide6.QtCore import Qt, QPoint
-from PySide6.QtGui import QFont
+                               QHBoxLayout, QPushButton, QLabel, QStackedWidget, QFrame,
+                               QButtonGroup)
+from PySide6.QtCore import Qt, QPointF, QTimer, QRectF, QSize
+from PySide6.QtGui import QFont, QPainterPath, QRegion, QPixmap, QPainter, QColor
 
-from modules import PDFEditorModule, OCRTrainerModule, SchedulerModule, MailDrafterModule
+# Shared title font, created on first use (needs a QApplication)
+_TITLE_FONT = None
 
 class CustomTitleBar(QWidget):
     """Custom draggable title bar with window controls"""
@@ -17,52 +20,48 @@ class CustomTitleBar(QWidget):
         self.parent_window = parent
         self.start_pos = None
         self.setFixedHeight(45)
+        self.setMouseTracking(False)  # Only deliver moves while a button is held
+        
+        # Coalesce drag moves: mouse events only accumulate the delta and
+        # the timer applies it at ~120Hz instead of on every mouse event
+        self._pending_delta = QPointF()
+        self._move_timer = QTimer(self)
+        self._move_timer.setInterval(8)
+        self._move_timer.timeout.connect(self.flush_move)
         
         layout = QHBoxLayout(self)
         layout.setContentsMargins(15, 0, 10, 0)
         layout.setSpacing(0)
         
         # App Title
+        global _TITLE_FONT
+        if _TITLE_FONT is None:
+            _TITLE_FONT = QFont("Segoe UI", 12, QFont.Bold)
         title = QLabel("🗂️ Custom Reporting Automation Hub")
-        title.setFont(QFont("Segoe UI", 12, QFont.Bold))
-        title.setStyleSheet("color: #00D9FF; letter-spacing: 1px;")
+        title.setFont(_TITLE_FONT)
+        title.setObjectName("appTitle")
         layout.addWidget(title)
         layout.addStretch()
         
-        # Window Control Buttons
-        btn_style = """
-            QPushButton {
-                background: transparent;
-                border: none;
-                color: white;
-                font-size: 16px;
-                padding: 8px 12px;
-                border-radius: 4px;
-            }
-            QPushButton:hover {
-                background: rgba(255, 255, 255, 0.1);
-            }
-        """
-        
+        # Window Control Buttons (styled by MainWindow's global stylesheet)
         self.btn_minimize = QPushButton("─")
         self.btn_maximize = QPushButton("□")
         self.btn_close = QPushButton("✕")
         
+        self.btn_minimize.setObjectName("titleBtn")
+        self.btn_maximize.setObjectName("titleBtn")
+        self.btn_close.setObjectName("titleClose")
+        
         for btn in [self.btn_minimize, self.btn_maximize, self.btn_close]:
-            btn.setStyleSheet(btn_style)
             btn.setFixedSize(40, 35)
         
-        self.btn_close.setStyleSheet(btn_style + """
-            QPushButton:hover { background: #E81123; }
-        """)
-        
         self.btn_minimize.clicked.connect(parent.showMinimized)
         self.btn_maximize.clicked.connect(self.toggle_maximize)
         self.btn_close.clicked.connect(parent.close)
         
         # Theme Toggle
         self.btn_theme = QPushButton("🌓")
-        self.btn_theme.setStyleSheet(btn_style)
+        self.btn_theme.setObjectName("titleBtn")
         self.btn_theme.setFixedSize(40, 35)
         self.btn_theme.clicked.connect(parent.toggle_theme)
         
@@ -79,34 +78,119 @@ class CustomTitleBar(QWidget):
     
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton:
-            self.start_pos = event.globalPosition().toPoint()
+            self.start_pos = event.globalPosition()
+            self._pending_delta = QPointF()
+            self._move_timer.start()
     
     def mouseMoveEvent(self, event):
-        if self.start_pos:
-            delta = event.globalPosition().toPoint() - self.start_pos
-            self.parent_window.move(self.parent_window.pos() + delta)
-            self.start_pos = event.globalPosition().toPoint()
+        if self.start_pos is None:
+            return
+        # Stay in QPointF; rounding to QPoint happens once per applied move
+        pos = event.globalPosition()
+        self._pending_delta += pos - self.start_pos
+        self.start_pos = pos
     
     def mouseReleaseEvent(self, event):
+        self._move_timer.stop()
+        self.flush_move()
         self.start_pos = None
+    
+    def flush_move(self):
+        """Apply the drag delta accumulated since the last tick"""
+        step = self._pending_delta.toPoint()
+        if step.x() == 0 and step.y() == 0:
+            return  # Sub-pixel motion only; keep accumulating
+        self.parent_window.move(self.parent_window.pos() + step)
+        self._pending_delta -= QPointF(step)
+
+class Sidebar(QFrame):
+    """Navigation sidebar that blits its themed background from a cached pixmap"""
+    # (background, right border) per theme
+    COLORS = {
+        "dark": (QColor(30, 41, 59, 178), QColor(255, 255, 255, 25)),
+        "light": (QColor(255, 255, 255, 178), QColor(0, 0, 0, 13)),
+    }
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.theme = "dark"
+        self._bg_cache = None
+    
+    def set_theme(self, theme):
+        if theme != self.theme:
+            self.theme = theme
+            self._bg_cache = None
+            self.update()
+    
+    def resizeEvent(self, event):
+        self._bg_cache = None
+        super().resizeEvent(event)
+    
+    def paintEvent(self, event):
+        # Rebuilt when the window moves to a screen with another scale factor
+        if self._bg_cache is None or self._bg_cache.devicePixelRatio() != self.devicePixelRatioF():
+            self._bg_cache = self.render_background()
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self._bg_cache)
+        painter.end()
+        super().paintEvent(event)
+    
+    def render_background(self):
+        """Rasterize the background (rounded bottom-left corner + right border) once"""
+        background, border = self.COLORS[self.theme]
+        w, h = self.width(), self.height()
+        
+        # Device pixels, so the corner and border stay sharp on scaled displays
+        dpr = self.devicePixelRatioF()
+        pixmap = QPixmap(self.size() * dpr)
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        
+        path = QPainterPath()
+        path.moveTo(0, 0)
+        path.lineTo(w, 0)
+        path.lineTo(w, h)
+        path.lineTo(16, h)
+        path.arcTo(QRectF(0, h - 32, 32, 32), 270, -90)
+        path.closeSubpath()
+        painter.fillPath(path, background)
+        painter.fillRect(w - 1, 0, 1, h, border)
+        
+        painter.end()
+        return pixmap
 
 class MainWindow(QMainWindow):
     """Main application window with sidebar navigation"""
-    def __init__(self):
+    # Built stylesheets keyed by theme name, shared across windows
+    _STYLE_CACHE = {}
+    
+    def __init__(self, translucent=False):
         super().__init__()
         self.setWindowTitle("Automation Hub")
         self.setGeometry(100, 100, 1400, 900)
         self.setWindowFlags(Qt.FramelessWindowHint)
-        self.setAttribute(Qt.WA_TranslucentBackground)
+        
+        # Per-pixel alpha gives soft rounded corners but forces a full window
+        # composite on every move/resize; the default opaque window clips
+        # its corners with a mask instead (see resizeEvent)
+        self.translucent = translucent
+        if translucent:
+            self.setAttribute(Qt.WA_TranslucentBackground)
         
         self.current_theme = "dark"
+        self._applied_theme = None
+        self._mask_size = None
+        self._mask_region = None
         
         # Central Widget
         central = QWidget()
         central.setObjectName("centralWidget")
         self.setCentralWidget(central)
         main_layout = QVBoxLayout(central)
-        main_layout.setContentsMargins(10, 10, 10, 10) # Margin for window shadow/rounded corners
+        margin = 10 if translucent else 0 # Margin for window shadow/rounded corners
+        main_layout.setContentsMargins(margin, margin, margin, margin)
         main_layout.setSpacing(0)
         
         # Main Container (for rounded corners)
@@ -133,16 +217,28 @@ class MainWindow(QMainWindow):
         # Stacked Widget for Modules
         self.content_stack = QStackedWidget()
         
-        # Instantiate Modules
-        self.pdf_module = PDFEditorModule()
-        self.ocr_module = OCRTrainerModule()
-        self.scheduler_module = SchedulerModule()
-        self.mail_module = MailDrafterModule(self.pdf_module)
+        # Imported here, after main() has set the app style, so no module
+        # widget is created (and polished) before Fusion is in place
+        from modules import PDFEditorModule, OCRTrainerModule, SchedulerModule, MailDrafterModule
         
-        self.content_stack.addWidget(self.pdf_module)
-        self.content_stack.addWidget(self.ocr_module)
-        self.content_stack.addWidget(self.scheduler_module)
-        self.content_stack.addWidget(self.mail_module)
+        # Modules are built on first navigation; placeholders hold their slots
+        self._module_factories = {
+            0: PDFEditorModule,
+            1: OCRTrainerModule,
+            2: SchedulerModule,
+            3: lambda: MailDrafterModule(self.get_module(0)),
+        }
+        self._modules = {}
+        for _ in self._module_factories:
+            self.content_stack.addWidget(QWidget())
+        
+        # PDF Editor is the landing page
+        self.get_module(0)
+        self.content_stack.setCurrentIndex(0)
+        
+        # Saved jobs must fire even if the Scheduler tab is never opened;
+        # build it once the window is up so startup paint is not delayed
+        QTimer.singleShot(0, lambda: self.get_module(2))
         
         content_layout.addWidget(self.content_stack)
         container_layout.addLayout(content_layout)
@@ -150,9 +246,24 @@ class MainWindow(QMainWindow):
         # Apply Styling
         self.apply_styles()
     
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        # Clip to rounded corners with a mask so the interior can take Qt's
+        # opaque fast paths. When translucent the mask goes on the container,
+        # which sits inside the 10px layout margin.
+        margin = 10 if self.translucent else 0
+        size = self.size() - QSize(2 * margin, 2 * margin)
+        if size != self._mask_size:
+            path = QPainterPath()
+            path.addRoundedRect(QRectF(0, 0, size.width(), size.height()), 16, 16)
+            self._mask_region = QRegion(path.toFillPolygon().toPolygon())
+            self._mask_size = size
+            target = self.container if self.translucent else self
+            target.setMask(self._mask_region)
+    
     def create_sidebar(self):
         """Create navigation sidebar"""
-        sidebar = QFrame()
+        sidebar = Sidebar()
         sidebar.setFixedWidth(240)
         sidebar.setObjectName("sidebar")
         
@@ -165,8 +276,11 @@ class MainWindow(QMainWindow):
         info.setObjectName("modulesLabel")
         layout.addWidget(info)
         
-        # Navigation Buttons
+        # Navigation Buttons (exclusive checkable group; the active button is
+        # styled via the native :checked pseudo-state, no repolish needed)
         self.nav_buttons = []
+        self.nav_group = QButtonGroup(self)
+        self.nav_group.setExclusive(True)
         modules = [
             ("📄 PDF Editor", 0),
             ("🔍 OCR Trainer", 1),
@@ -178,9 +292,11 @@ class MainWindow(QMainWindow):
             btn = QPushButton(text)
             btn.setObjectName("navButton")
             btn.setFixedHeight(48)
-            btn.clicked.connect(lambda checked, i=index: self.switch_module(i))
+            btn.setCheckable(True)
+            self.nav_group.addButton(btn, index)
             layout.addWidget(btn)
             self.nav_buttons.append(btn)
+        self.nav_group.idClicked.connect(self.switch_module)
         
         layout.addStretch()
         
@@ -191,19 +307,31 @@ class MainWindow(QMainWindow):
         layout.addWidget(footer)
         
         # Activate first module
-        self.nav_buttons[0].setProperty("active", True)
+        self.nav_buttons[0].setChecked(True)
+        self._active_index = 0
         
         return sidebar
     
+    def get_module(self, index):
+        """Return the module at index, constructing it on first use"""
+        module = self._modules.get(index)
+        if module is None:
+            module = self._module_factories[index]()
+            placeholder = self.content_stack.widget(index)
+            self.content_stack.removeWidget(placeholder)
+            placeholder.deleteLater()
+            self.content_stack.insertWidget(index, module)
+            self._modules[index] = module
+        return module
+    
     def switch_module(self, index):
         """Switch between modules"""
+        if index == self._active_index:
+            return
+        self.get_module(index)
         self.content_stack.setCurrentIndex(index)
-        
-        # Update button states
-        for i, btn in enumerate(self.nav_buttons):
-            btn.setProperty("active", i == index)
-            btn.style().unpolish(btn)
-            btn.style().polish(btn)
+        self.nav_buttons[index].setChecked(True)
+        self._active_index = index
             
     def toggle_theme(self):
         self.current_theme = "light" if self.current_theme == "dark" else "dark"
@@ -211,11 +339,22 @@ class MainWindow(QMainWindow):
     
     def apply_styles(self):
         """Apply global stylesheet based on theme"""
+        if self._applied_theme == self.current_theme:
+            return
+        stylesheet = self._STYLE_CACHE.get(self.current_theme)
+        if stylesheet is None:
+            stylesheet = self.build_stylesheet(self.current_theme)
+            self._STYLE_CACHE[self.current_theme] = stylesheet
+        self.setStyleSheet(stylesheet)
+        self.sidebar.set_theme(self.current_theme)
+        self._applied_theme = self.current_theme
+    
+    def build_stylesheet(self, theme):
+        """Build the global stylesheet string for a theme"""
         
-        if self.current_theme == "dark":
+        if theme == "dark":
             # Dark Glassmorphism Theme
             bg_gradient = "qlineargradient(x1:0, y1:0, x2:1, y2:1, stop:0 #0f172a, stop:1 #1e293b)"
-            sidebar_bg = "rgba(30, 41, 59, 0.7)"
             text_color = "#e2e8f0"
             secondary_text = "#94a3b8"
             accent_color = "#3b82f6"
@@ -226,7 +365,6 @@ class MainWindow(QMainWindow):
         else:
             # Light Glassmorphism Theme
             bg_gradient = "qlineargradient(x1:0, y1:0, x2:1, y2:1, stop:0 #f8fafc, stop:1 #e2e8f0)"
-            sidebar_bg = "rgba(255, 255, 255, 0.7)"
             text_color = "#1e293b"
             secondary_text = "#64748b"
             accent_color = "#3b82f6"
@@ -235,7 +373,7 @@ class MainWindow(QMainWindow):
             btn_hover = "rgba(0, 0, 0, 0.05)"
             input_bg = "rgba(255, 255, 255, 0.8)"
 
-        self.setStyleSheet(f"""
+        return f"""
             QMainWindow {{
                 background: transparent;
             }}
@@ -246,17 +384,33 @@ class MainWindow(QMainWindow):
                 border: 1px solid {border_color};
             }}
             
-            #sidebar {{
-                background: {sidebar_bg};
-                border-right: 1px solid {border_color};
-                border-top-left-radius: 0px;
-                border-bottom-left-radius: 16px;
-            }}
-            
             QLabel {{
                 color: {text_color};
             }}
             
+            /* Title Bar */
+            QLabel#appTitle {{
+                color: #00D9FF;
+                letter-spacing: 1px;
+            }}
+            
+            QPushButton#titleBtn, QPushButton#titleClose {{
+                background: transparent;
+                border: none;
+                color: white;
+                font-size: 16px;
+                padding: 8px 12px;
+                border-radius: 4px;
+            }}
+            
+            QPushButton#titleBtn:hover {{
+                background: rgba(255, 255, 255, 0.1);
+            }}
+            
+            QPushButton#titleClose:hover {{
+                background: #E81123;
+            }}
+            
             #modulesLabel {{
                 color: {secondary_text};
                 font-size: 11px; 
@@ -287,7 +441,7 @@ class MainWindow(QMainWindow):
                 color: {text_color};
             }}
             
-            QPushButton#navButton[active="true"] {{
+            QPushButton#navButton:checked {{
                 background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #6366f1, stop:1 #8b5cf6);
                 color: white;
                 font-weight: 600;
@@ -358,10 +512,14 @@ class MainWindow(QMainWindow):
             QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {{
                 height: 0px;
             }}
-        """)
+        """
 
 def main():
     """Application entry point"""
+    # "--debug" turns on the modules' debug logging (template save/extraction details)
+    logging.basicConfig(level=logging.DEBUG if "--debug" in sys.argv else logging.WARNING,
+                        format="%(asctime)s %(name)s %(levelname)s: %(message)s")
+    
     # Enable High DPI
     QApplication.setHighDpiScaleFactorRoundingPolicy(
         Qt.HighDpiScaleFactorRoundingPolicy.PassThrough)
@@ -2,74 +2,187 @@
 Automation Hub - All Business Logic & Modules
 Contains: PDF Editor, OCR Trainer, Scheduler, Database, Utilities
 """
+import logging
 import os
 import re
-import fitz  # PyMuPDF
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, namedtuple
+from contextlib import contextmanager
+from functools import lru_cache
+from operator import itemgetter
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
                                QLabel, QFileDialog, QScrollArea, QTableWidget,
                                QTableWidgetItem, QLineEdit, QSpinBox, QComboBox,
                                QTextEdit, QListWidget, QDialog, QDialogButtonBox,
                                QMessageBox, QGraphicsScene, QGraphicsView,
-                               QGraphicsRectItem, QTabWidget, QMainWindow, QInputDialog)
-from PySide6.QtCore import Qt, QPointF, QRectF, Signal, QThread
+                               QGraphicsRectItem, QTabWidget, QMainWindow, QInputDialog,
+                               QApplication)
+from PySide6.QtCore import Qt, QPointF, QRectF, Signal, QThread, QObject, QRunnable, QThreadPool
 from PySide6.QtGui import QPixmap, QImage, QPen, QColor, QBrush
-from sqlalchemy import create_engine, Column, Integer, String, Float, ForeignKey, Boolean, DateTime
+from sqlalchemy import create_engine, event, select, insert, update, delete, Index, Column, Integer, String, Float, ForeignKey, Boolean, DateTime
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, relationship
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.cron import CronTrigger
-from apscheduler.triggers.interval import IntervalTrigger
-from apscheduler.triggers.date import DateTrigger
+from sqlalchemy.orm import sessionmaker, relationship, joinedload
+from sqlalchemy.pool import QueuePool
 import subprocess
 import uuid
-import pandas as pd
 import datetime
-import win32com.client
-import pythoncom
+
+logger = logging.getLogger(__name__)
 
 # ============================================================================
 # OFFICE CONVERTER
 # ============================================================================
 
 class OfficeConverter:
+    """Office -> PDF through one COM thread that keeps each Office app open between files"""
+    _apps = {}  # "powerpoint" / "excel" / "word" -> Application, touched only on the COM thread
+    _owned = set()  # Kinds whose Application this process started, and so may Quit
+    _queue = None  # Work for the COM thread; None until the first conversion
+    _lock = threading.Lock()
+    
+    @classmethod
+    def _call(cls, fn, *args):
+        """Run fn on the COM thread (started on first use) and return its result"""
+        from concurrent.futures import Future
+        with cls._lock:
+            if cls._queue is None:
+                import atexit
+                import queue
+                cls._queue = queue.Queue()
+                # COM proxies belong to the apartment that created them, so every
+                # call on the cached apps has to come from this one thread
+                threading.Thread(target=cls._com_loop, args=(cls._queue,),
+                                 name="office-com", daemon=True).start()
+                atexit.register(cls.shutdown)
+            q = cls._queue
+        future = Future()
+        q.put((fn, args, future))
+        return future.result()
+    
     @staticmethod
-    def convert_to_pdf(input_path):
-        """Convert PPT/Excel/Word to PDF using win32com"""
-        input_path = os.path.abspath(input_path)
-        base, ext = os.path.splitext(input_path)
-        output_path = base + "_converted.pdf"
-        
+    def _com_loop(q):
+        # pywin32 loads only once something is actually converted
+        import pythoncom
+        pythoncom.CoInitialize()
+        try:
+            while (item := q.get()) is not None:
+                fn, args, future = item
+                try:
+                    future.set_result(fn(*args))
+                except Exception as e:
+                    future.set_exception(e)
+        finally:
+            pythoncom.CoUninitialize()
+    
+    @classmethod
+    def _get_app(cls, kind):
+        """Cached Application for kind, dispatched on first use (COM thread only)"""
+        app = cls._apps.get(kind)
+        if app is None:
+            import win32com.client
+            if kind == "powerpoint":
+                # PowerPoint is single-instance: this attaches to the user's copy if
+                # one is running. An app with no window and nothing open is ours
+                app = win32com.client.DispatchEx("Powerpoint.Application")
+                if not app.Visible and app.Presentations.Count == 0:
+                    cls._owned.add(kind)
+            elif kind == "excel":
+                app = win32com.client.DispatchEx("Excel.Application")
+                if not app.Visible and app.Workbooks.Count == 0:
+                    cls._owned.add(kind)
+                app.Visible = False
+                app.DisplayAlerts = False
+                app.ScreenUpdating = False
+            else:
+                app = win32com.client.DispatchEx("Word.Application")
+                if not app.Visible and app.Documents.Count == 0:
+                    cls._owned.add(kind)
+                app.Visible = False
+                app.DisplayAlerts = 0  # wdAlertsNone
+                app.ScreenUpdating = False
+            cls._apps[kind] = app
+        return app
+    
+    @classmethod
+    def _convert(cls, input_path, output_path, ext):
+        kind = None
         try:
-            pythoncom.CoInitialize()
-            ext = ext.lower()
-            
             if ext in ['.pptx', '.ppt']:
-                powerpoint = win32com.client.Dispatch("Powerpoint.Application")
-                presentation = powerpoint.Presentations.Open(input_path, WithWindow=False)
+                kind = "powerpoint"
+                presentation = cls._get_app(kind).Presentations.Open(input_path, WithWindow=False)
                 presentation.SaveAs(output_path, 32) # 32 = ppSaveAsPDF
                 presentation.Close()
-                # powerpoint.Quit() # Keep open for performance?
                 
             elif ext in ['.xlsx', '.xls']:
-                excel = win32com.client.Dispatch("Excel.Application")
-                excel.Visible = False
-                wb = excel.Workbooks.Open(input_path)
+                kind = "excel"
+                wb = cls._get_app(kind).Workbooks.Open(input_path)
                 wb.ExportAsFixedFormat(0, output_path) # 0 = xlTypePDF
                 wb.Close(False)
-                # excel.Quit()
                 
             elif ext in ['.docx', '.doc']:
-                word = win32com.client.Dispatch("Word.Application")
-                word.Visible = False
-                doc = word.Documents.Open(input_path)
+                kind = "word"
+                doc = cls._get_app(kind).Documents.Open(input_path)
                 doc.SaveAs(output_path, 17) # 17 = wdFormatPDF
                 doc.Close()
-                # word.Quit()
-                
-            return output_path
-        except Exception as e:
-            print(f"Conversion failed: {e}")
+        except Exception:
+            # The user may have closed the app; dispatch a fresh one next time
+            cls._apps.pop(kind, None)
+            cls._owned.discard(kind)
+            raise
+        return output_path
+    
+    @classmethod
+    def _quit_apps(cls):
+        # Only apps started here are quit; an instance the user had open (with
+        # their own unsaved files) just loses this process's reference
+        for kind, app in cls._apps.items():
+            if kind in cls._owned:
+                try:
+                    app.Quit()
+                except Exception:
+                    pass
+        cls._apps.clear()
+        cls._owned.clear()
+    
+    @staticmethod
+    def convert_to_pdf(input_path):
+        """Convert PPT/Excel/Word to PDF using win32com"""
+        input_path = os.path.abspath(input_path)
+        base, ext = os.path.splitext(input_path)
+        output_path = base + "_converted.pdf"
+        
+        try:
+            return OfficeConverter._call(OfficeConverter._convert, input_path, output_path, ext.lower())
+        except Exception:
+            logger.exception("Conversion of %s failed", input_path)
             return None
+    
+    @staticmethod
+    def convert_many(paths):
+        """Convert several files; yields (path, pdf path or None) as each finishes"""
+        # PowerPoint is a single-instance COM server, so parallel workers would only
+        # queue behind (or be rejected by) one POWERPNT.EXE. Files go through the
+        # COM thread one after another, reusing the open app between them
+        for path in paths:
+            yield path, OfficeConverter.convert_to_pdf(path)
+    
+    @classmethod
+    def shutdown(cls):
+        """Quit the Office apps started here and stop the COM thread"""
+        with cls._lock:
+            q, cls._queue = cls._queue, None
+        if q is None:
+            return
+        from concurrent.futures import Future
+        future = Future()
+        q.put((cls._quit_apps, (), future))
+        q.put(None)
+        try:
+            future.result(timeout=30)
+        except Exception:
+            logger.warning("Office shutdown error", exc_info=True)
 
 # ============================================================================
 # DATABASE SETUP
@@ -77,9 +190,11 @@ class OfficeConverter:
 
 Base = declarative_base()
 DB_PATH = "data/automation_hub.db"
-os.makedirs("data", exist_ok=True)
-engine = create_engine(f"sqlite:///{DB_PATH}")
-SessionLocal = sessionmaker(bind=engine)
+SCHEMA_VERSION = 1  # Bump when adding tables or indexes so existing databases pick them up
+engine = None  # Created by init_db() on first database access
+# Objects stay readable after commit (no re-SELECT on the next UI refresh);
+# code that needs fresh rows expires them itself, flushes are explicit
+SessionLocal = sessionmaker(expire_on_commit=False, autoflush=False)
 
 class Template(Base):
     __tablename__ = "templates"
@@ -99,6 +214,8 @@ class Field(Base):
     width = Column(Float)
     height = Column(Float)
     template = relationship("Template", back_populates="fields")
+    
+    __table_args__ = (Index("ix_fields_template", "template_id"),)
 
 class Job(Base):
     __tablename__ = "jobs"
@@ -113,18 +230,211 @@ class Job(Base):
     recurrence_time = Column(String, nullable=True)  # Time of day for daily/weekly/monthly (HH:MM)
     day_of_week = Column(String, nullable=True)  # For weekly (e.g., "0,2,4" for Mon/Wed/Fri)
     day_of_month = Column(Integer, nullable=True)  # For monthly
-    last_run = Column(DateTime, nullable=True)
-    next_run = Column(DateTime, nullable=True)
     enabled = Column(Boolean, default=True)
     misfire_grace_time = Column(Integer, default=300)  # 5 minutes default
 
-Base.metadata.create_all(engine)
+def init_db():
+    """Create the data directory, engine and schema on first use"""
+    global engine
+    if engine is not None:
+        return
+    os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+    # Room for every statement the app issues; a recompile only on cache miss.
+    # GUI, extraction and scheduler threads share a pool of open connections
+    # instead of reopening the file for each session
+    engine = create_engine(f"sqlite:///{DB_PATH}", query_cache_size=1200,
+                           poolclass=QueuePool, pool_size=5, max_overflow=10,
+                           connect_args={"check_same_thread": False})
+    
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_conn, _):
+        cursor = dbapi_conn.cursor()
+        if DB_PATH != ":memory:":
+            # WAL: commits append to a log and readers never block the writer
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            # Let bursts of small commits pile up in the log; close_db() folds it back
+            cursor.execute("PRAGMA wal_autocheckpoint=4000")
+            cursor.execute("PRAGMA mmap_size=268435456")  # Read pages straight from the mapping
+        cursor.execute("PRAGMA busy_timeout=5000")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-65536")  # 64 MB
+        cursor.close()
+    
+    SessionLocal.configure(bind=engine)
+    # One PRAGMA read on a current database instead of introspecting every table
+    with engine.connect() as conn:
+        version = conn.exec_driver_sql("PRAGMA user_version").scalar()
+    if version != SCHEMA_VERSION:
+        Base.metadata.create_all(engine)
+        # create_all only indexes tables it creates; add new indexes to existing databases
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(engine, checkfirst=True)
+        with engine.begin() as conn:
+            conn.exec_driver_sql(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    
+    import atexit
+    atexit.register(close_db)
+
+def close_db():
+    """Refresh planner statistics, checkpoint the WAL and release connections"""
+    global engine
+    if engine is None:
+        return
+    try:
+        with engine.connect() as conn:
+            # ANALYZE whatever the session's queries showed to lack statistics,
+            # so the planner knows to use the template/job indexes
+            conn.exec_driver_sql("PRAGMA optimize")
+            conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+    except Exception:
+        logger.warning("Database checkpoint error", exc_info=True)
+    engine.dispose()
+    engine = None
+
+def get_session():
+    """Open a new session, initializing the database if needed"""
+    init_db()
+    return SessionLocal()
 
 # ============================================================================
-# PDF EDITOR MODULE
+# IMAGE UTILITIES
 # ============================================================================
 
+@lru_cache(maxsize=32)
+def zoom_matrix(scale):
+    """Shared fitz.Matrix per zoom level (treat as read-only)"""
+    import fitz
+    return fitz.Matrix(scale, scale)
+
+def render_page_rgba(page, scale):
+    """Rasterize a page as opaque 4-channel RGBA, the layout Qt blits without repacking"""
+    import fitz
+    pix = page.get_pixmap(matrix=zoom_matrix(scale))
+    # Rendering with alpha=True would leave the page background transparent;
+    # adding the channel afterwards fills it with 255 instead
+    return fitz.Pixmap(pix, 1)
+
+def image_is_gray(doc, xref):
+    """True if the image XObject has a single colour component"""
+    kind, cs = doc.xref_get_key(xref, "ColorSpace")
+    if kind == "xref":
+        cs = doc.xref_object(int(cs.split()[0]), compressed=True)
+    elif kind == "null":
+        return doc.xref_get_key(xref, "ImageMask")[1] == "true"
+    if cs in ("/DeviceGray", "/CalGray") or cs.startswith(("[/CalGray", "[/Indexed/DeviceGray")):
+        return True
+    if cs.startswith("[/ICCBased"):
+        return doc.xref_get_key(int(cs.split()[1]), "N") == ("int", "1")
+    return False
+
+def page_is_gray(page):
+    """Detect scan-like pages: only grayscale images, no vector art, no coloured text"""
+    # Annotations, link borders and form widgets are rendered too and may carry colour
+    if page.first_annot is not None or page.first_widget is not None or page.first_link is not None:
+        return False
+    images = page.get_images()
+    if not images or not all(image_is_gray(page.parent, img[0]) for img in images):
+        return False
+    if page.get_cdrawings():
+        return False
+    # A page without font resources has no text: skip the structured extraction.
+    # Scans usually land here; the listing only reads the resource dictionaries
+    if not page.get_fonts():
+        return True
+    for block in page.get_text("dict", flags=0)["blocks"]:
+        for line in block.get("lines", ()):
+            for span in line["spans"]:
+                c = span["color"]
+                if not (c >> 16 == (c >> 8) & 0xFF == c & 0xFF):
+                    return False
+    return True
+
+def render_page_gray(page, scale):
+    """Rasterize a page to one byte per pixel"""
+    import fitz
+    return page.get_pixmap(matrix=zoom_matrix(scale), colorspace=fitz.csGRAY)
+
+def qimage_format(pix):
+    if pix.n == 1:
+        return QImage.Format_Grayscale8
+    return QImage.Format_RGBA8888 if pix.alpha else QImage.Format_RGB888
+
+def qimage_view(pix):
+    """Wrap a fitz.Pixmap's samples in a QImage without copying"""
+    fmt = qimage_format(pix)
+    # Qt's stride-less constructor assumes tightly packed, 32-bit aligned scanlines;
+    # that holds for every RGBA raster; RGB rows need it unless width is a multiple of 4
+    if pix.stride == pix.width * pix.n and pix.stride % 4 == 0:
+        return QImage(pix.samples_mv, pix.width, pix.height, fmt)
+    return QImage(pix.samples_mv, pix.width, pix.height, pix.stride, fmt)
+
+def fitz_to_qimage(pix):
+    """Copy a fitz.Pixmap into a QImage that owns its pixels (safe across threads)"""
+    return qimage_view(pix).copy()
+
+def fitz_to_qpixmap(pix):
+    """Convert a fitz.Pixmap to a QPixmap without copying its samples to bytes"""
+    # samples_mv is a view onto MuPDF's buffer, so the QImage borrows it;
+    # QPixmap.fromImage makes the only copy while pix is still alive
+    return QPixmap.fromImage(qimage_view(pix))
+
+@contextmanager
+def batch_updates(table):
+    """Fill a QTableWidget with repaints and signals held until the end"""
+    table.setUpdatesEnabled(False)
+    table.blockSignals(True)
+    try:
+        yield table
+    finally:
+        table.blockSignals(False)
+        table.setUpdatesEnabled(True)
+        table.viewport().update()
+
+class RenderSignals(QObject):
+    done = Signal(int, object, QImage)  # token, (page, scale), image
+
+class RenderTask(QRunnable):
+    """Rasterize one page on a pool thread and post the QImage back to the tab"""
+    def __init__(self, doc, doc_lock, page_index, scale, token, current_token=None, gray_pages=None):
+        super().__init__()
+        self.doc = doc
+        self.doc_lock = doc_lock
+        self.page_index = page_index
+        self.scale = scale
+        self.token = token
+        self.current_token = current_token  # Returns the tab's latest token
+        self.gray_pages = gray_pages if gray_pages is not None else {}  # page index -> bool
+        self.signals = RenderSignals()  # Created on the GUI thread -> queued delivery
+    
+    def is_stale(self):
+        return self.current_token is not None and self.current_token() != self.token
+    
+    def run(self):
+        try:
+            # MuPDF documents are not thread-safe; PDFTab.editing() takes the same lock
+            with self.doc_lock:
+                # Rapid paging queues several tasks; only the newest is worth rasterizing
+                if self.is_stale():
+                    return
+                page = self.doc.load_page(self.page_index)
+                gray = self.gray_pages.get(self.page_index)
+                if gray is None:
+                    gray = self.gray_pages[self.page_index] = page_is_gray(page)
+                # Grayscale scans need a third of the bytes of an RGB raster
+                pix = render_page_gray(page, self.scale) if gray else render_page_rgba(page, self.scale)
+                img = fitz_to_qimage(pix)
+        except Exception as e:
+            print(f"Render error: {e}")
+            return
+        self.signals.done.emit(self.token, (self.page_index, self.scale), img)
+
 class PDFTab(QWidget):
+    PIX_CACHE_SIZE = 16
+    PIX_CACHE_BYTES = 256 * 1024 * 1024  # High zoom levels hit this before the page count
+    PREFETCH_PAGES = 1  # Neighbours rendered ahead on each side of the page on screen
+    
     def __init__(self, doc, path=None, is_temp=False, temp_path=None):
         super().__init__()
         self.doc = doc
@@ -134,6 +444,19 @@ class PDFTab(QWidget):
         self.is_temp = is_temp
         self.temp_path = temp_path
         self.parent_dock = None  # Will be set by PDFEditorModule
+        
+        # LRU of rendered pages keyed by (page index, scale)
+        self._pix_cache = OrderedDict()
+        self._pix_cache_bytes = 0
+        self._gray_pages = {}  # Filled in by RenderTask
+        self._words_cache = {}  # page index -> page.get_text("words"), until the next edit
+        
+        # Pages are rasterized on the global thread pool; the token discards
+        # results that arrive after the page, zoom or document changed
+        self.doc_lock = threading.Lock()
+        self._render_token = 0
+        self._render_task = None
+        self._prefetch_tasks = []
         self.setup_ui()
 
     def setup_ui(self):
@@ -227,15 +550,18 @@ class PDFTab(QWidget):
         
         self.render()
     
-    def zoom_in(self):
-        self.scale *= 1.2
+    def set_scale(self, scale):
+        """Change zoom and redraw"""
+        # Rounded so zooming in and back out lands on the same cache/matrix key
+        self.scale = round(scale, 4)
         self.update_zoom_label()
         self.render()
     
+    def zoom_in(self):
+        self.set_scale(self.scale * 1.2)
+    
     def zoom_out(self):
-        self.scale /= 1.2
-        self.update_zoom_label()
-        self.render()
+        self.set_scale(self.scale / 1.2)
     
     def fit_to_screen(self):
         """Fit to width (same as fit_to_width for backward compatibility)"""
@@ -244,24 +570,20 @@ class PDFTab(QWidget):
     def fit_to_width(self):
         if not self.doc: return
         try:
-            page = self.doc.load_page(self.current_page)
-            page_width = page.rect.width
+            with self.doc_lock:
+                page_width = self.doc.load_page(self.current_page).rect.width
             scroll_width = self.scroll.width() - 40  # Account for margins
-            self.scale = scroll_width / page_width
-            self.update_zoom_label()
-            self.render()
+            self.set_scale(scroll_width / page_width)
         except Exception as e:
             print(f"Fit width error: {e}")
     
     def fit_to_height(self):
         if not self.doc: return
         try:
-            page = self.doc.load_page(self.current_page)
-            page_height = page.rect.height
+            with self.doc_lock:
+                page_height = self.doc.load_page(self.current_page).rect.height
             scroll_height = self.scroll.height() - 40  # Account for margins
-            self.scale = scroll_height / page_height
-            self.update_zoom_label()
-            self.render()
+            self.set_scale(scroll_height / page_height)
         except Exception as e:
             print(f"Fit height error: {e}")
     
@@ -305,13 +627,92 @@ class PDFTab(QWidget):
             self.btn_prev.setEnabled(self.current_page > 0)
             self.btn_next.setEnabled(self.current_page < total_pages - 1)
             
-            page = self.doc.load_page(self.current_page)
-            pix = page.get_pixmap(matrix=fitz.Matrix(self.scale, self.scale))
-            img = QImage(pix.samples, pix.width, pix.height, pix.stride, QImage.Format_RGB888)
-            self.label.setPixmap(QPixmap.fromImage(img))
+            self._render_token += 1
+            key = (self.current_page, self.scale)
+            pixmap = self._pix_cache.get(key)
+            if pixmap is not None:
+                self._pix_cache.move_to_end(key)
+                self.label.setPixmap(pixmap)
+                self.prefetch()
+                return
+            
+            task = RenderTask(self.doc, self.doc_lock, self.current_page, self.scale,
+                              self._render_token, lambda: self._render_token, self._gray_pages)
+            task.signals.done.connect(self.on_rendered)
+            self._render_task = task
+            QThreadPool.globalInstance().start(task)
         except Exception as e:
             print(f"Render error: {e}")
     
+    def on_rendered(self, token, key, img):
+        """Receive a page rendered by RenderTask (GUI thread)"""
+        if token != self._render_token:
+            return  # Stale: page/zoom changed or document edited meanwhile
+        self.label.setPixmap(self.cache_pixmap(key, img))
+        self.prefetch()
+    
+    def prefetch(self):
+        """Render pages next to the current one into the cache on the pool"""
+        # Queued behind nothing visible; a page/zoom change or edit bumps the
+        # token, so RenderTask skips prefetches that are no longer wanted
+        tasks = []
+        for offset in range(1, self.PREFETCH_PAGES + 1):
+            for index in (self.current_page + offset, self.current_page - offset):
+                if 0 <= index < len(self.doc) and (index, self.scale) not in self._pix_cache:
+                    task = RenderTask(self.doc, self.doc_lock, index, self.scale,
+                                      self._render_token, lambda: self._render_token, self._gray_pages)
+                    task.signals.done.connect(self.on_prefetched)
+                    tasks.append(task)
+                    QThreadPool.globalInstance().start(task)
+        self._prefetch_tasks = tasks  # Keep the signals objects alive until delivery
+    
+    def on_prefetched(self, token, key, img):
+        if token == self._render_token and key not in self._pix_cache:
+            self.cache_pixmap(key, img)
+    
+    def cache_pixmap(self, key, img):
+        """Store a rendered page in the LRU and return its pixmap"""
+        pixmap = QPixmap.fromImage(img)
+        self._pix_cache[key] = pixmap
+        self._pix_cache_bytes += self.pixmap_bytes(pixmap)
+        # Evict least recently viewed pages, always keeping the newest
+        while len(self._pix_cache) > 1 and (len(self._pix_cache) > self.PIX_CACHE_SIZE
+                                            or self._pix_cache_bytes > self.PIX_CACHE_BYTES):
+            _, old = self._pix_cache.popitem(last=False)
+            self._pix_cache_bytes -= self.pixmap_bytes(old)
+        return pixmap
+    
+    @staticmethod
+    def pixmap_bytes(pixmap):
+        return pixmap.width() * pixmap.height() * pixmap.depth() // 8
+    
+    def page_words(self, page):
+        """Word tuples of a page, extracted once per document revision"""
+        words = self._words_cache.get(page.number)
+        if words is None:
+            words = self._words_cache[page.number] = page.get_text("words")
+        return words
+    
+    def clear_cache(self):
+        self._pix_cache.clear()
+        self._gray_pages.clear()
+        self._words_cache.clear()
+        self._pix_cache_bytes = 0
+    
+    def invalidate(self):
+        """Drop cached page renders after the document was modified and redraw"""
+        self.clear_cache()
+        self.render()
+    
+    @contextmanager
+    def editing(self):
+        """Hold the document lock while modifying it, then redraw"""
+        try:
+            with self.doc_lock:
+                yield self.doc
+        finally:
+            self.invalidate()
+    
     def cleanup(self):
         """Clean up temp files if this is a temp PDF"""
         if self.is_temp and self.temp_path and os.path.exists(self.temp_path):
@@ -320,16 +721,212 @@ class PDFTab(QWidget):
                 print(f"Deleted temp file: {self.temp_path}")
             except Exception as e:
                 print(f"Failed to delete temp file: {e}")
+    
+    def release(self):
+        """Close the document now instead of waiting for garbage collection"""
+        self._render_token += 1  # Drop any render still in flight
+        self.clear_cache()
+        with self.doc_lock:
+            if self.doc is not None:
+                self.doc.close()
+                self.doc = None
 
 
+# Footer text treated as a page number: "3", "Page 3", "3 of 10", "Page 3 of 10"
+PAGE_NUMBER_RE = re.compile(r"^(?:Page\s+)?\d+(?:\s+of\s+\d+)?$", re.IGNORECASE)
+
+def words_in(words, rect):
+    """Words from page.get_text("words") whose box overlaps rect"""
+    x0, y0, x1, y1 = rect
+    return [w for w in words if w[0] < x1 and w[2] > x0 and w[1] < y1 and w[3] > y0]
+
+class OpenSignals(QObject):
+    done = Signal(object, str, bool, object)  # doc, original path, is_temp, temp path
+    failed = Signal(str)
+
+class OpenTask(QRunnable):
+    """Convert (if needed) and parse a file on a pool thread"""
+    def __init__(self, path, temp_dir):
+        super().__init__()
+        self.path = path
+        self.temp_dir = temp_dir
+        self.signals = OpenSignals()
+    
+    def run(self):
+        import fitz
+        try:
+            path = self.path
+            is_temp = False
+            temp_path = None
+            
+            # Convert if Office file
+            if path.lower().endswith(('.pptx', '.xlsx', '.docx')):
+                # Generate temp filename
+                import shutil
+                temp_filename = f"{uuid.uuid4().hex}.pdf"
+                temp_path = os.path.join(self.temp_dir, temp_filename)
+                
+                # Convert to temp location
+                converted_path = OfficeConverter.convert_to_pdf(path)
+                if not converted_path:
+                    raise Exception("Conversion failed")
+                
+                shutil.move(converted_path, temp_path)
+                path = temp_path
+                is_temp = True
+            
+            doc = fitz.open(path)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+            return
+        self.signals.done.emit(doc, self.path, is_temp, temp_path)
+
+class CompressSignals(QObject):
+    done = Signal(str, bytes)   # path, compressed PDF
+    failed = Signal(str)
+
+class CompressTask(QRunnable):
+    """Serialize a document with full compression on a pool thread"""
+    def __init__(self, doc, doc_lock, path, max_compression=False):
+        super().__init__()
+        self.doc = doc
+        self.doc_lock = doc_lock
+        self.path = path
+        self.max_compression = max_compression
+        self.signals = CompressSignals()
+    
+    def run(self):
+        options = dict(garbage=4, clean=True, deflate=True,
+                       deflate_images=True, deflate_fonts=True)
+        if self.max_compression:
+            # Pack objects into object streams and let MuPDF spend maximum effort on deflate
+            options.update(use_objstms=1, compression_effort=100)
+        try:
+            with self.doc_lock:
+                data = self.doc.tobytes(**options)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+            return
+        self.signals.done.emit(self.path, data)
+
+class ConvertSignals(QObject):
+    progress = Signal(int, int)  # files done, total
+    done = Signal(list)          # [(input path, PDF path or None)]
+
+class ConvertTask(QRunnable):
+    """Convert a batch of Office files to PDF on a pool thread"""
+    def __init__(self, paths):
+        super().__init__()
+        self.paths = paths
+        self.signals = ConvertSignals()
+    
+    def run(self):
+        results = []
+        for result in OfficeConverter.convert_many(self.paths):
+            results.append(result)
+            self.signals.progress.emit(len(results), len(self.paths))
+        self.signals.done.emit(results)
+
+class ThumbnailSignals(QObject):
+    ready = Signal(int, int, QImage)  # source index, page number, thumbnail
+    failed = Signal(str)
+
+class ThumbnailTask(QRunnable):
+    """Render page thumbnails of open documents on a pool thread"""
+    def __init__(self, sources, doc_lock, scale=0.3):
+        super().__init__()
+        self.sources = sources  # [(source index, fitz.Document)]
+        self.doc_lock = doc_lock
+        self.scale = scale
+        self.cancelled = False  # Set from the GUI thread to stop early
+        self.signals = ThumbnailSignals()
+    
+    def run(self):
+        try:
+            for idx, doc in self.sources:
+                for page_num in range(len(doc)):
+                    # Lock per page so the GUI thread can merge between thumbnails
+                    with self.doc_lock:
+                        # Sources close when the dialog ends, which cancels the task first
+                        if self.cancelled:
+                            return
+                        pix = doc.load_page(page_num).get_pixmap(matrix=zoom_matrix(self.scale), alpha=False)
+                        image = fitz_to_qimage(pix)
+                    self.signals.ready.emit(idx, page_num, image)
+        except Exception as e:
+            # A live task losing its document would otherwise merge with pages missing
+            self.signals.failed.emit(str(e))
+
+class PageJobSignals(QObject):
+    progress = Signal(int, int)  # pages done, total
+    done = Signal(int)           # sum of the per-page results
+    failed = Signal(str)
+
+class PageJob(QRunnable):
+    """Apply an edit to each page of a document on a pool thread"""
+    def __init__(self, doc, doc_lock, edit_page, pages=None):
+        super().__init__()
+        self.doc = doc
+        self.doc_lock = doc_lock
+        self.edit_page = edit_page  # page -> count (or None)
+        self.pages = pages          # page indices, all pages if None
+        self.signals = PageJobSignals()
+    
+    def run(self):
+        count = 0
+        try:
+            # One document is not safe to edit from several threads, so pages are
+            # processed in order under the tab's lock, off the GUI thread
+            with self.doc_lock:
+                pages = range(len(self.doc)) if self.pages is None else self.pages
+                total = len(pages)
+                for n, index in enumerate(pages, 1):
+                    count += self.edit_page(self.doc[index]) or 0
+                    self.signals.progress.emit(n, total)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+            return
+        self.signals.done.emit(count)
+
 class PDFEditorModule(QWidget):
     def __init__(self):
         super().__init__()
         # Create temp directory
         self.temp_dir = os.path.join(os.getcwd(), ".temp_pdfs")
         os.makedirs(self.temp_dir, exist_ok=True)
+        self._open_tasks = set()  # Files being opened in the background
+        self._source_docs = {}  # (path, mtime) -> read-only fitz.Document of the open merge dialog
+        self._retired_sources = []  # Replaced by a newer mtime but maybe still in a thumbnail task
+        self.source_lock = threading.RLock()  # Cached sources are shared with ThumbnailTask
+        self._thumb_task = None
         self.setup_ui()
     
+    def open_source(self, path):
+        """Read-only document for a merge dialog, kept open until close_sources()"""
+        import fitz
+        key = (os.path.abspath(path), os.path.getmtime(path))
+        with self.source_lock:
+            doc = self._source_docs.get(key)
+            if doc is not None:
+                return doc
+        doc = fitz.open(path)
+        # No size cap: every document here may still be referenced by the dialog
+        # (thumbnails, base_doc), so nothing is closed before close_sources()
+        with self.source_lock:
+            # The file changed since it was cached: later lookups get the new copy
+            for stale in [k for k in self._source_docs if k[0] == key[0]]:
+                self._retired_sources.append(self._source_docs.pop(stale))
+            self._source_docs[key] = doc
+        return doc
+    
+    def close_sources(self):
+        """Close the merge dialog's source documents so the files aren't held open"""
+        with self.source_lock:  # A cancelled thumbnail task may still be mid-page
+            for doc in (*self._source_docs.values(), *self._retired_sources):
+                doc.close()
+            self._source_docs.clear()
+            self._retired_sources.clear()
+    
     def setup_ui(self):
         layout = QVBoxLayout(self)
         layout.setContentsMargins(20, 20, 20, 20)
@@ -430,6 +1027,8 @@ class PDFEditorModule(QWidget):
             if reply == QMessageBox.Yes:
                 self.save_pdf(dock.widget())
             
+            if tab and hasattr(tab, 'release'):
+                tab.release()
             self.dock_manager.removeDockWidget(dock)
             dock.deleteLater()
             self.docks.remove(dock)
@@ -439,61 +1038,59 @@ class PDFEditorModule(QWidget):
                                    QMessageBox.Yes | QMessageBox.No)
         if reply == QMessageBox.Yes:
             for dock in list(self.docks):
+                tab = dock.widget()
+                if tab and hasattr(tab, 'release'):
+                    tab.release()
                 self.dock_manager.removeDockWidget(dock)
                 dock.deleteLater()
             self.docks.clear()
 
     def open_pdf(self):
+        from PySide6.QtWidgets import QProgressDialog
         path, _ = QFileDialog.getOpenFileName(self, "Open File", "", "Files (*.pdf *.pptx *.xlsx *.docx)")
-        if path:
-            try:
-                is_temp = False
-                temp_path = None
-                original_path = path
-                
-                # Convert if Office file
-                if path.lower().endswith(('.pptx', '.xlsx', '.docx')):
-                    # Generate temp filename
-                    import uuid
-                    temp_filename = f"{uuid.uuid4().hex}.pdf"
-                    temp_path = os.path.join(self.temp_dir, temp_filename)
-                    
-                    # Convert to temp location
-                    import shutil
-                    converted_path = OfficeConverter.convert_to_pdf(path)
-                    if not converted_path:
-                        raise Exception("Conversion failed")
-                    
-                    shutil.move(converted_path, temp_path)
-                    path = temp_path
-                    is_temp = True
-                
-                doc = fitz.open(path)
-                tab = PDFTab(doc, original_path, is_temp=is_temp, temp_path=temp_path)
-                
-                # Create Dock Widget
-                from PySide6.QtWidgets import QDockWidget
-                dock = QDockWidget(os.path.basename(original_path), self)
-                dock.setWidget(tab)
-                dock.setAllowedAreas(Qt.AllDockWidgetAreas)
-                dock.setFeatures(QDockWidget.DockWidgetMovable | QDockWidget.DockWidgetFloatable | QDockWidget.DockWidgetClosable)
-                
-                # Set parent_dock reference
-                tab.parent_dock = dock
-                
-                # Rename feature via context menu
-                dock.setContextMenuPolicy(Qt.CustomContextMenu)
-                dock.customContextMenuRequested.connect(lambda pos, d=dock: self.dock_context_menu(pos, d))
-                
-                self.dock_manager.addDockWidget(Qt.RightDockWidgetArea, dock)
-                if self.docks:
-                    self.dock_manager.tabifyDockWidget(self.docks[-1], dock)
-                
-                self.docks.append(dock)
-                dock.show()
-                
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to open file: {e}")
+        if not path: return
+        
+        # Office conversion and xref parsing can take seconds; keep the UI live
+        task = OpenTask(path, self.temp_dir)
+        progress = QProgressDialog(f"Opening {os.path.basename(path)}...", None, 0, 0, self)
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(300)
+        task.signals.done.connect(progress.close)
+        task.signals.failed.connect(progress.close)
+        task.signals.done.connect(lambda *_: self._open_tasks.discard(task))
+        task.signals.failed.connect(lambda _: self._open_tasks.discard(task))
+        task.signals.done.connect(self.add_pdf_tab)
+        task.signals.failed.connect(lambda msg: QMessageBox.critical(self, "Error", f"Failed to open file: {msg}"))
+        self._open_tasks.add(task)  # Keep the signals object alive until delivery
+        QThreadPool.globalInstance().start(task)
+    
+    def add_pdf_tab(self, doc, original_path, is_temp, temp_path):
+        try:
+            tab = PDFTab(doc, original_path, is_temp=is_temp, temp_path=temp_path)
+            
+            # Create Dock Widget
+            from PySide6.QtWidgets import QDockWidget
+            dock = QDockWidget(os.path.basename(original_path), self)
+            dock.setWidget(tab)
+            dock.setAllowedAreas(Qt.AllDockWidgetAreas)
+            dock.setFeatures(QDockWidget.DockWidgetMovable | QDockWidget.DockWidgetFloatable | QDockWidget.DockWidgetClosable)
+            
+            # Set parent_dock reference
+            tab.parent_dock = dock
+            
+            # Rename feature via context menu
+            dock.setContextMenuPolicy(Qt.CustomContextMenu)
+            dock.customContextMenuRequested.connect(lambda pos, d=dock: self.dock_context_menu(pos, d))
+            
+            self.dock_manager.addDockWidget(Qt.RightDockWidgetArea, dock)
+            if self.docks:
+                self.dock_manager.tabifyDockWidget(self.docks[-1], dock)
+            
+            self.docks.append(dock)
+            dock.show()
+            
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to open file: {e}")
     
     def dock_context_menu(self, pos, dock):
         from PySide6.QtWidgets import QMenu
@@ -514,7 +1111,9 @@ class PDFEditorModule(QWidget):
         path, _ = QFileDialog.getSaveFileName(self, "Save PDF", "", "PDF Files (*.pdf)")
         if path:
             try:
-                tab.doc.save(path)
+                # Renders and prefetches may be reading the document on the pool
+                with tab.doc_lock:
+                    tab.doc.save(path)
                 QMessageBox.information(self, "Success", "PDF saved successfully!")
                 # Update dock title
                 for dock in self.docks:
@@ -524,49 +1123,118 @@ class PDFEditorModule(QWidget):
                 QMessageBox.critical(self, "Error", str(e))
     
     def ppt_to_pdf(self):
-        path, _ = QFileDialog.getOpenFileName(self, "Select PPT", "", "PowerPoint (*.pptx *.ppt)")
-        if path:
-            pdf_path = OfficeConverter.convert_to_pdf(path)
-            if pdf_path:
-                QMessageBox.information(self, "Success", f"Converted to: {pdf_path}")
-            else:
-                QMessageBox.critical(self, "Error", "Conversion failed")
+        from PySide6.QtWidgets import QProgressDialog
+        paths, _ = QFileDialog.getOpenFileNames(self, "Select PPT", "", "PowerPoint (*.pptx *.ppt)")
+        if not paths:
+            return
+        
+        task = ConvertTask(paths)
+        progress = QProgressDialog("Converting...", None, 0, len(paths), self)
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(0)
+        
+        def finish(results):
+            progress.close()
+            self._convert_task = None
+            converted = [pdf_path for _, pdf_path in results if pdf_path]
+            failed = [os.path.basename(path) for path, pdf_path in results if not pdf_path]
+            if failed:
+                QMessageBox.critical(self, "Error", "Conversion failed:\n" + "\n".join(failed))
+            if converted:
+                QMessageBox.information(self, "Success", "Converted to:\n" + "\n".join(converted))
+        
+        task.signals.progress.connect(lambda done, total: progress.setValue(done))
+        task.signals.done.connect(finish)
+        self._convert_task = task  # Keep the signals object alive until delivery
+        QThreadPool.globalInstance().start(task)
 
     def compress_pdf(self):
+        from PySide6.QtWidgets import QProgressDialog
         tab = self.current_tab()
         if not tab: return
         
         path, _ = QFileDialog.getSaveFileName(self, "Save Compressed PDF", "", "PDF Files (*.pdf)")
-        if path:
-            try:
-                # Save compressed to new file
-                tab.doc.save(path, garbage=4, deflate=True)
-                # Open result in new tab
-                new_doc = fitz.open(path)
-                new_tab = PDFTab(new_doc, path)
-                
-                # Create Dock Widget
-                from PySide6.QtWidgets import QDockWidget
-                dock = QDockWidget(os.path.basename(path), self)
-                dock.setWidget(new_tab)
-                dock.setAllowedAreas(Qt.AllDockWidgetAreas)
-                dock.setFeatures(QDockWidget.DockWidgetMovable | QDockWidget.DockWidgetFloatable | QDockWidget.DockWidgetClosable)
-                dock.setContextMenuPolicy(Qt.CustomContextMenu)
-                dock.customContextMenuRequested.connect(lambda pos, d=dock: self.dock_context_menu(pos, d))
-                
-                # Set parent_dock reference
-                new_tab.parent_dock = dock
-                
-                self.dock_manager.addDockWidget(Qt.RightDockWidgetArea, dock)
-                if self.docks:
-                    self.dock_manager.tabifyDockWidget(self.docks[-1], dock)
-                self.docks.append(dock)
-                dock.show()
-                
-                QMessageBox.information(self, "Success", "Compressed PDF opened in new tab!")
-            except Exception as e:
-                QMessageBox.critical(self, "Error", str(e))
+        if not path: return
+        
+        reply = QMessageBox.question(self, "Compression",
+                                     "Use max compression? (smaller file, slower)",
+                                     QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+        
+        # Compress once in memory on the pool: the same bytes go to disk and
+        # into the new tab, so the result is never re-read from disk
+        task = CompressTask(tab.doc, tab.doc_lock, path, reply == QMessageBox.Yes)
+        progress = QProgressDialog("Compressing PDF...", None, 0, 0, self)
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(0)
+        task.signals.done.connect(self.open_compressed)
+        task.signals.failed.connect(lambda msg: QMessageBox.critical(self, "Error", msg))
+        task.signals.done.connect(progress.close)
+        task.signals.failed.connect(progress.close)
+        self._compress_task = task  # Keep the signals object alive until delivery
+        progress.show()
+        QThreadPool.globalInstance().start(task)
+    
+    def open_compressed(self, path, data):
+        import fitz
+        try:
+            with open(path, "wb") as f:
+                f.write(data)
+            # Open result in new tab
+            new_doc = fitz.open("pdf", data)
+            new_tab = PDFTab(new_doc, path)
+            
+            # Create Dock Widget
+            from PySide6.QtWidgets import QDockWidget
+            dock = QDockWidget(os.path.basename(path), self)
+            dock.setWidget(new_tab)
+            dock.setAllowedAreas(Qt.AllDockWidgetAreas)
+            dock.setFeatures(QDockWidget.DockWidgetMovable | QDockWidget.DockWidgetFloatable | QDockWidget.DockWidgetClosable)
+            dock.setContextMenuPolicy(Qt.CustomContextMenu)
+            dock.customContextMenuRequested.connect(lambda pos, d=dock: self.dock_context_menu(pos, d))
+            
+            # Set parent_dock reference
+            new_tab.parent_dock = dock
+            
+            self.dock_manager.addDockWidget(Qt.RightDockWidgetArea, dock)
+            if self.docks:
+                self.dock_manager.tabifyDockWidget(self.docks[-1], dock)
+            self.docks.append(dock)
+            dock.show()
+            
+            QMessageBox.information(self, "Success", "Compressed PDF opened in new tab!")
+        except Exception as e:
+            QMessageBox.critical(self, "Error", str(e))
 
+    def run_page_job(self, tab, edit_page, on_done, pages=None, changed=None):
+        """Run edit_page over the tab's pages in the background with a progress dialog"""
+        from PySide6.QtWidgets import QProgressDialog
+        job = PageJob(tab.doc, tab.doc_lock, edit_page, pages)
+        progress = QProgressDialog("Updating pages...", None, 0, 0, self)
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(500)
+        
+        def update(done, total):
+            progress.setMaximum(total)
+            progress.setValue(done)
+        
+        def finish(count):
+            progress.close()
+            # changed(count) lets a job that found nothing to do keep the caches
+            if changed is None or changed(count):
+                tab.invalidate()
+            on_done(count)
+        
+        def fail(msg):
+            progress.close()
+            tab.invalidate()
+            QMessageBox.critical(self, "Error", msg)
+        
+        job.signals.progress.connect(update)
+        job.signals.done.connect(finish)
+        job.signals.failed.connect(fail)
+        self._page_job = job  # Keep the signals object alive until delivery
+        QThreadPool.globalInstance().start(job)
+    
     def merge_pdfs(self):
         """Show merge options: Simple or Header-Based"""
         choice_dialog = QDialog(self)
@@ -576,12 +1244,17 @@ class PDFEditorModule(QWidget):
         
         layout.addWidget(QLabel("<h3>How would you like to merge PDFs?</h3>"))
         
+        from PySide6.QtWidgets import QCheckBox
+        keep_annots = QCheckBox("Keep links and annotations (slower)")
+        keep_annots.setChecked(True)
+        layout.addWidget(keep_annots)
+        
         btn_simple = QPushButton("📑 Simple Merge with Page Rearranging")
-        btn_simple.clicked.connect(lambda: (choice_dialog.accept(), self.merge_simple()))
+        btn_simple.clicked.connect(lambda: (choice_dialog.accept(), self.merge_simple(keep_annots.isChecked())))
         layout.addWidget(btn_simple)
         
         btn_headers = QPushButton("📌 Header-Based Merge (Insert PDFs after headers)")
-        btn_headers.clicked.connect(lambda: (choice_dialog.accept(), self.merge_with_headers()))
+        btn_headers.clicked.connect(lambda: (choice_dialog.accept(), self.merge_with_headers(keep_annots.isChecked())))
         layout.addWidget(btn_headers)
         
         btn_cancel = QPushButton("Cancel")
@@ -590,8 +1263,9 @@ class PDFEditorModule(QWidget):
         
         choice_dialog.exec()
     
-    def merge_simple(self):
+    def merge_simple(self, keep_annots=True):
         """Simple merge with page-level rearranging"""
+        import fitz
         from PySide6.QtWidgets import QListWidgetItem
         from PySide6.QtCore import QSize
         
@@ -666,22 +1340,37 @@ class PDFEditorModule(QWidget):
         
         # Load pages logic
         def load_pages():
+            if self._thumb_task:
+                self._thumb_task.cancelled = True
             page_listwidget.clear()
+            sources, names = [], {}
             for i in range(pdf_listwidget.count()):
                 pdf_path = pdf_listwidget.item(i).text()
                 try:
-                    doc = fitz.open(pdf_path)
-                    pdf_name = os.path.basename(pdf_path)
-                    for page_num in range(len(doc)):
-                        page = doc.load_page(page_num)
-                        pix = page.get_pixmap(matrix=fitz.Matrix(0.3, 0.3))
-                        img = QImage(pix.samples, pix.width, pix.height, pix.stride, QImage.Format_RGB888)
-                        item = QListWidgetItem(QPixmap.fromImage(img), f"{pdf_name}\nP{page_num + 1}")
-                        item.setData(Qt.UserRole, (i, page_num))
-                        page_listwidget.addItem(item)
-                    doc.close()
+                    # Cached: reloading pages or merging reuses the parsed document
+                    sources.append((i, self.open_source(pdf_path)))
+                    names[i] = os.path.basename(pdf_path)
                 except Exception as e:
                     print(f"Error: {e}")
+            
+            # Thumbnails render on the pool and arrive one by one, in order
+            task = ThumbnailTask(sources, self.source_lock)
+            
+            def add_thumb(pdf_idx, page_num, image):
+                if task.cancelled:  # Queued from a load that was replaced
+                    return
+                item = QListWidgetItem(QPixmap.fromImage(image), f"{names[pdf_idx]}\nP{page_num + 1}")
+                item.setData(Qt.UserRole, (pdf_idx, page_num))
+                page_listwidget.addItem(item)
+            
+            def thumb_failed(message):
+                if not task.cancelled:
+                    QMessageBox.warning(dialog, "Merge", f"Could not load all pages: {message}")
+            
+            task.signals.ready.connect(add_thumb)
+            task.signals.failed.connect(thumb_failed)
+            self._thumb_task = task  # Keep the signals object alive until replaced
+            QThreadPool.globalInstance().start(task)
         btn_load_pages.clicked.connect(load_pages)
         
         buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
@@ -689,18 +1378,31 @@ class PDFEditorModule(QWidget):
         buttons.rejected.connect(dialog.reject)
         layout.addWidget(buttons)
         
-        if dialog.exec() == QDialog.Accepted and page_listwidget.count() > 0:
+        accepted = dialog.exec() == QDialog.Accepted
+        if self._thumb_task:
+            self._thumb_task.cancelled = True
+        if accepted and page_listwidget.count() > 0:
             try:
                 merged = fitz.open()
-                pdf_docs = [fitz.open(pdf_listwidget.item(i).text()) for i in range(pdf_listwidget.count())]
                 
+                # Collapse consecutive pages of the same PDF into one page range
+                runs = []
                 for i in range(page_listwidget.count()):
-                    item = page_listwidget.item(i)
-                    pdf_idx, page_num = item.data(Qt.UserRole)
-                    merged.insert_pdf(pdf_docs[pdf_idx], from_page=page_num, to_page=page_num)
-                
-                for doc in pdf_docs:
-                    doc.close()
+                    pdf_idx, page_num = page_listwidget.item(i).data(Qt.UserRole)
+                    if runs and runs[-1][0] == pdf_idx and runs[-1][2] == page_num - 1:
+                        runs[-1][2] = page_num
+                    else:
+                        runs.append([pdf_idx, page_num, page_num])
+                
+                # final=False keeps each source's graft map between inserts, so shared
+                # fonts/images are copied once; the source's last run releases it.
+                # Sources come from the cache load_pages filled, not a second parse
+                last_run = {pdf_idx: n for n, (pdf_idx, _, _) in enumerate(runs)}
+                with self.source_lock:  # A cancelled thumbnail task may still be mid-page
+                    for n, (pdf_idx, first, last) in enumerate(runs):
+                        src = self.open_source(pdf_listwidget.item(pdf_idx).text())
+                        merged.insert_pdf(src, from_page=first, to_page=last, final=last_run[pdf_idx] == n,
+                                          links=keep_annots, annots=keep_annots)
                 
                 tab = PDFTab(merged, "Merged.pdf")
                 
@@ -725,9 +1427,11 @@ class PDFEditorModule(QWidget):
                 QMessageBox.information(self, "Success", f"Merged {page_listwidget.count()} pages!")
             except Exception as e:
                 QMessageBox.critical(self, "Error", str(e))
+        self.close_sources()
     
-    def merge_with_headers(self):
+    def merge_with_headers(self, keep_annots=True):
         """Header-based merge: Insert PDFs after specific header pages"""
+        import fitz
         from PySide6.QtWidgets import QListWidgetItem, QStackedWidget
         
         dialog = QDialog(self)
@@ -818,7 +1522,7 @@ class PDFEditorModule(QWidget):
                 header_container_layout.itemAt(i).widget().deleteLater()
             
             try:
-                doc = fitz.open(base_pdf)
+                doc = self.open_source(base_pdf)
                 from PySide6.QtWidgets import QCheckBox
                 for page_num in range(len(doc)):
                     row = QHBoxLayout()
@@ -936,21 +1640,31 @@ class PDFEditorModule(QWidget):
         if dialog.exec() == QDialog.Accepted:
             try:
                 # Build final merged PDF
-                base_doc = fitz.open(base_pdf)
+                base_doc = self.open_source(base_pdf)  # Already parsed for step 2
                 merged = fitz.open()
                 
-                for page_num in range(len(base_doc)):
-                    # Insert base page
-                    merged.insert_pdf(base_doc, from_page=page_num, to_page=page_num)
+                skipped = []
+                
+                # Copy base pages in ranges up to each header; final=False keeps the
+                # base graft map so shared resources are copied only once
+                last_page = len(base_doc) - 1
+                start = 0
+                for page_num in sorted({p for p in insertions if p <= last_page} | {last_page}):
+                    if page_num >= start:
+                        merged.insert_pdf(base_doc, from_page=start, to_page=page_num,
+                                          links=keep_annots, annots=keep_annots,
+                                          final=(page_num == last_page))
+                        start = page_num + 1
                     
-                    # If this is a header, insert PDFs after it
-                    if page_num in insertions:
-                        for pdf_path in insertions[page_num]:
-                            insert_doc = fitz.open(pdf_path)
-                            merged.insert_pdf(insert_doc)
-                            insert_doc.close()
-                
-                base_doc.close()
+                    # If this is a header, insert PDFs after it; a file that
+                    # fails to open is skipped instead of aborting the merge
+                    for pdf_path in insertions.get(page_num, ()):
+                        try:
+                            insert_doc = self.open_source(pdf_path)
+                        except Exception:
+                            skipped.append(os.path.basename(pdf_path))
+                            continue
+                        merged.insert_pdf(insert_doc, links=keep_annots, annots=keep_annots)
                 
                 tab = PDFTab(merged, "Merged_Headers.pdf")
                 
@@ -972,16 +1686,23 @@ class PDFEditorModule(QWidget):
                 self.docks.append(dock)
                 dock.show()
                 
+                if skipped:
+                    QMessageBox.warning(self, "Merge", "Skipped unreadable files:\n" + "\n".join(skipped))
                 QMessageBox.information(self, "Success", "Header-based merge complete!")
             except Exception as e:
                 QMessageBox.critical(self, "Error", str(e))
+        self.close_sources()
 
     def split_pdf(self):
         """Dynamic PDF split with user-specified page ranges"""
+        import fitz
         tab = self.current_tab()
         if not tab: return
         
         total_pages = len(tab.doc)
+        if total_pages < 2:
+            QMessageBox.information(self, "Split PDF", "This PDF has nothing to split.")
+            return
         
         dialog = QDialog(self)
         dialog.setWindowTitle("Split PDF")
@@ -1022,11 +1743,21 @@ class PDFEditorModule(QWidget):
                 if not pages:
                     QMessageBox.warning(self, "Warning", "No valid pages selected")
                     return
+                if len(pages) == total_pages:
+                    QMessageBox.information(self, "Split PDF", "All pages selected - nothing to split.")
+                    return
                 
-                # Create split PDF
+                # Create split PDF, copying each contiguous run of pages at once
                 new_doc = fitz.open()
+                runs = []
                 for page_num in pages:
-                    new_doc.insert_pdf(tab.doc, from_page=page_num, to_page=page_num)
+                    if runs and runs[-1][1] == page_num - 1:
+                        runs[-1][1] = page_num
+                    else:
+                        runs.append([page_num, page_num])
+                with tab.doc_lock:
+                    for first, last in runs:
+                        new_doc.insert_pdf(tab.doc, from_page=first, to_page=last)
                 
                 new_tab = PDFTab(new_doc, "Split.pdf")
                 
@@ -1053,46 +1784,46 @@ class PDFEditorModule(QWidget):
                 QMessageBox.critical(self, "Error", str(e))
 
     def redact_page_numbers(self):
+        import fitz
         tab = self.current_tab()
         if not tab: return
+        if len(tab.doc) == 0:
+            QMessageBox.information(self, "Success", "Redacted 0 locations in Bottom Center/Right.")
+            return
         
-        try:
-            doc = tab.doc
+        def redact(page):
+            rect = page.rect
+            w, h = rect.width, rect.height
             count = 0
-            patterns = [
-                r"^\d+$", r"^Page\s+\d+$", r"^\d+\s+of\s+\d+$", r"^Page\s+\d+\s+of\s+\d+$"
-            ]
             
-            for page in doc:
-                rect = page.rect
-                w, h = rect.width, rect.height
-                
-                # Define regions: Bottom Center (middle 33%) and Bottom Right (right 33%)
-                # Bottom 10% height
-                regions = [
-                    fitz.Rect(w * 0.33, h * 0.9, w * 0.66, h), # Bottom Center
-                    fitz.Rect(w * 0.66, h * 0.9, w, h)         # Bottom Right
-                ]
-                
-                for region in regions:
-                    blocks = page.get_text("dict", clip=region)["blocks"]
-                    for b in blocks:
-                        for l in b["lines"]:
-                            for s in l["spans"]:
-                                text = s["text"].strip()
-                                for pat in patterns:
-                                    if re.match(pat, text, re.IGNORECASE):
-                                        page.add_redact_annot(fitz.Rect(s["bbox"]), fill=(1, 1, 1))
-                                        count += 1
-                                        break
-                page.apply_redactions()
-            
-            tab.render() # Refresh view
-            QMessageBox.information(self, "Success", f"Redacted {count} locations in Bottom Center/Right.")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", str(e))
+            # Bottom Center (middle 33%) and Bottom Right (right 33%), bottom 10% height:
+            # adjacent regions, so a single extraction over their union covers both
+            region = fitz.Rect(w * 0.33, h * 0.9, w, h)
+            
+            # Flat (x0, y0, x1, y1, word, block, line, word_no) tuples;
+            # regroup into lines so "Page 3 of 10" is matched as a whole
+            lines = {}
+            for w in words_in(tab.page_words(page), region):
+                lines.setdefault((w[5], w[6]), []).append(w)
+            
+            for line_words in lines.values():
+                if PAGE_NUMBER_RE.match(" ".join(w[4] for w in line_words)):
+                    # Plain min/max over the tuples; a Rect is built only for a hit
+                    bbox = fitz.Rect(min(w[0] for w in line_words), min(w[1] for w in line_words),
+                                     max(w[2] for w in line_words), max(w[3] for w in line_words))
+                    page.add_redact_annot(bbox, fill=(1, 1, 1))
+                    count += 1
+            if count:  # Leave pages without page numbers untouched
+                # Only text is targeted: leave images and vector art as they are
+                page.apply_redactions(images=fitz.PDF_REDACT_IMAGE_NONE,
+                                      graphics=fitz.PDF_REDACT_LINE_ART_NONE)
+            return count
+        
+        self.run_page_job(tab, redact, lambda count: QMessageBox.information(
+            self, "Success", f"Redacted {count} locations in Bottom Center/Right."), changed=bool)
 
     def add_page_numbers(self):
+        import fitz
         tab = self.current_tab()
         if not tab: return
             
@@ -1127,47 +1858,53 @@ class PDFEditorModule(QWidget):
         
         if dialog.exec() == QDialog.Accepted:
             try:
-                doc = tab.doc
+                total = len(tab.doc)
+                fmt = fmt_combo.currentText()
+                font_size = size_spin.value()
+                pos_idx = pos_combo.currentIndex()
+                
+                # One flag per page, cleared by slice for each excluded range
+                include = bytearray(b"\x01") * (total + 1)
+                include[0] = 0
                 exclude_str = exclude_input.text().strip()
-                excluded = set()
                 if exclude_str:
                     for part in exclude_str.split(','):
                         if '-' in part:
                             start, end = map(int, part.split('-'))
-                            excluded.update(range(start, end + 1))
                         else:
-                            excluded.add(int(part))
-                
-                total = len(doc)
-                fmt = fmt_combo.currentText()
-                font_size = size_spin.value()
-                
-                for i, page in enumerate(doc):
-                    pg_num = i + 1
-                    if pg_num in excluded: continue
-                    
-                    if fmt == "n":
-                        text = f"{pg_num}"
-                    else:
-                        text = f"Page {pg_num} of {total}"
-                        
-                    rect = page.rect
-                    pos_idx = pos_combo.currentIndex()
-                    
-                    if pos_idx == 0: pt = fitz.Point(rect.width/2 - 30, rect.height - 20)
-                    elif pos_idx == 1: pt = fitz.Point(rect.width - 80, rect.height - 20)
-                    elif pos_idx == 2: pt = fitz.Point(20, rect.height - 20)
-                    elif pos_idx == 3: pt = fitz.Point(rect.width/2 - 30, 30)
-                    else: pt = fitz.Point(rect.width - 80, 30)
-                        
-                    page.insert_text(pt, text, fontsize=font_size, color=(0, 0, 0))
-                
-                tab.render()
-                QMessageBox.information(self, "Success", "Page numbers added! Preview updated.")
+                            start = end = int(part)
+                        start, end = max(start, 1), min(end, total)
+                        if start <= end:
+                            include[start:end + 1] = bytes(end - start + 1)
             except Exception as e:
                 QMessageBox.critical(self, "Error", str(e))
+                return
+            
+            font = fitz.Font("helv")  # Shared by every page's TextWriter
+            
+            # Resolve format and position once; the per-page body only fills them in
+            label = "{0}" if fmt == "n" else "Page {0} of " + str(total)
+            position = [
+                lambda w, h: (w/2 - 30, h - 20),  # Bottom Center
+                lambda w, h: (w - 80, h - 20),    # Bottom Right
+                lambda w, h: (20, h - 20),        # Bottom Left
+                lambda w, h: (w/2 - 30, 30),      # Top Center
+                lambda w, h: (w - 80, 30),        # Top Right
+            ][min(pos_idx, 4)]
+            
+            def number(page):
+                rect = page.rect
+                writer = fitz.TextWriter(rect, color=(0, 0, 0))
+                writer.append(position(rect.width, rect.height), label.format(page.number + 1),
+                              font=font, fontsize=font_size)
+                writer.write_text(page)
+            
+            pages = [i for i in range(total) if include[i + 1]]
+            self.run_page_job(tab, number, lambda count: QMessageBox.information(
+                self, "Success", "Page numbers added! Preview updated."), pages)
 
     def add_header_footer(self):
+        import fitz
         tab = self.current_tab()
         if not tab: return
             
@@ -1253,77 +1990,81 @@ class PDFEditorModule(QWidget):
             text = text_input.text()
             if not text: return
             
-            try:
-                doc = tab.doc
-                is_header = type_combo.currentText() == "Header"
-                align = align_combo.currentText()
-                size = size_spin.value()
-                color_name = color_combo.currentText().lower()
-                font_name = font_combo.currentText()
-                
-                # Map to PyMuPDF font names
-                font_map = {
-                    "Times New Roman": "times-roman",
-                    "Times-Roman": "times-roman",
-                    "Helvetica": "helv",
-                    "Courier": "cour",
-                    "Arial": "helv"  # Arial maps to Helvetica
-                }
-                fontname = font_map.get(font_name, "times-roman")
-                
-                # Map color names to RGB tuples
-                colors = {
-                    "black": (0, 0, 0),
-                    "red": (1, 0, 0),
-                    "blue": (0, 0, 1),
-                    "green": (0, 0.5, 0),
-                    "gray": (0.5, 0.5, 0.5)
-                }
-                color = colors.get(color_name, (0, 0, 0))
-                
-                for page in doc:
-                    rect = page.rect
+            is_header = type_combo.currentText() == "Header"
+            align = align_combo.currentText()
+            size = size_spin.value()
+            color_name = color_combo.currentText().lower()
+            font_name = font_combo.currentText()
+            
+            # Map to PyMuPDF font names
+            font_map = {
+                "Times New Roman": "times-roman",
+                "Times-Roman": "times-roman",
+                "Helvetica": "helv",
+                "Courier": "cour",
+                "Arial": "helv"  # Arial maps to Helvetica
+            }
+            fontname = font_map.get(font_name, "times-roman")
+            
+            # Map color names to RGB tuples
+            colors = {
+                "black": (0, 0, 0),
+                "red": (1, 0, 0),
+                "blue": (0, 0, 1),
+                "green": (0, 0.5, 0),
+                "gray": (0.5, 0.5, 0.5)
+            }
+            color = colors.get(color_name, (0, 0, 0))
+            
+            # The text is the same on every page, so lay it out once per page size
+            # and stamp the prepared glyph run onto each page
+            font = fitz.Font(fontname)
+            writers = {}
+            
+            # Exact advance width from the font's metrics, measured once per call
+            text_width = font.text_length(text, fontsize=size)
+            
+            def stamp(page):
+                rect = page.rect
+                key = (rect.width, rect.height)
+                writer = writers.get(key)
+                if writer is None:
                     y = 30 if is_header else rect.height - 20
                     
-                    # Calculate X based on text length (approx)
-                    text_width = len(text) * (size * 0.5) 
-                    
                     if align == "Center": x = (rect.width - text_width) / 2
                     elif align == "Left": x = 20
                     else: x = rect.width - 20 - text_width
                     
-                    page.insert_text(fitz.Point(x, y), text, fontname=fontname, fontsize=size, color=color)
-                
-                tab.render()
-                QMessageBox.information(self, "Success", "Header/Footer added! Preview updated.")
-            except Exception as e:
-                QMessageBox.critical(self, "Error", str(e))
+                    writer = fitz.TextWriter(rect, color=color)
+                    writer.append(fitz.Point(x, y), text, font=font, fontsize=size)
+                    writers[key] = writer
+                writer.write_text(page)
+            
+            self.run_page_job(tab, stamp, lambda count: QMessageBox.information(
+                self, "Success", "Header/Footer added! Preview updated."))
     
     def remove_header_footer(self, tab, parent_dialog):
         """Remove all text from header/footer regions"""
+        import fitz
         try:
-            doc = tab.doc
-            removed_count = 0
-            
-            for page in doc:
-                rect = page.rect
-                # Define header and footer regions (top 50px and bottom 50px)
-                header_rect = fitz.Rect(0, 0, rect.width, 50)
-                footer_rect = fitz.Rect(0, rect.height - 50, rect.width, rect.height)
+            with tab.editing() as doc:
+                removed_count = 0
                 
-                # Redact text in these regions
-                for region in [header_rect, footer_rect]:
-                    blocks = page.get_text("dict", clip=region)["blocks"]
-                    for block in blocks:
-                        if "lines" in block:
-                            for line in block["lines"]:
-                                for span in line["spans"]:
-                                    bbox = fitz.Rect(span["bbox"])
-                                    page.add_redact_annot(bbox, fill=(1, 1, 1))
-                                    removed_count += 1
-                    page.apply_redactions()
-            
-            tab.render()
+                for page in doc:
+                    rect = page.rect
+                    # Define header and footer regions (top 50px and bottom 50px)
+                    header_rect = fitz.Rect(0, 0, rect.width, 50)
+                    footer_rect = fitz.Rect(0, rect.height - 50, rect.width, rect.height)
+                    
+                    # Redact text in these regions
+                    words = tab.page_words(page)
+                    hits = words_in(words, header_rect) + words_in(words, footer_rect)
+                    for word in hits:
+                        page.add_redact_annot(fitz.Rect(word[:4]), fill=(1, 1, 1))
+                    if hits:
+                        page.apply_redactions()
+                        removed_count += len(hits)
+            
             parent_dialog.accept()
             QMessageBox.information(self, "Success", f"Removed text from header/footer regions!")
         except Exception as e:
@@ -1333,18 +2074,160 @@ class PDFEditorModule(QWidget):
 # OCR TRAINER MODULE
 # ============================================================================
 
+@lru_cache(maxsize=512)
+def field_name_pattern(name):
+    """Start of string, field name (case insensitive), optional colon/hyphen, whitespace"""
+    return re.compile(rf"^{re.escape(name)}[:\-\s]*", re.IGNORECASE)
+
+TemplateSnapshot = namedtuple("TemplateSnapshot", "name base_width base_height fields")
+FieldSnapshot = namedtuple("FieldSnapshot", "name x y width height")
+
+@lru_cache(maxsize=32)
+def template_snapshot(template_id):
+    """Detached copy of a template and its fields; clear after saving templates"""
+    with get_session() as session:
+        # Template and fields in one JOINed SELECT rather than a lazy second query
+        t = session.get(Template, template_id, options=[joinedload(Template.fields)])
+        if t is None:
+            return None
+        fields = tuple(FieldSnapshot(f.name, f.x, f.y, f.width, f.height) for f in t.fields)
+        return TemplateSnapshot(t.name, t.base_width, t.base_height, fields)
+
+def extract_field_values(page, template):
+    """(field name, text) for each template field on page; no rendering"""
+    page_rect = page.rect
+    
+    scale_x = page_rect.width / template.base_width
+    scale_y = page_rect.height / template.base_height
+    
+    debug = logger.isEnabledFor(logging.DEBUG)
+    if debug:
+        logger.debug("Extracting with template %s: base %.2f x %.2f, page %.2f x %.2f, "
+                     "scale X=%.4f Y=%.4f, %d fields",
+                     template.name, template.base_width, template.base_height,
+                     page_rect.width, page_rect.height, scale_x, scale_y, len(template.fields))
+    
+    # Walk the page content once; word centres sorted by y so each field
+    # bisects straight to its vertical band instead of scanning every word
+    centres = sorted((((wx0 + wx1) / 2, (wy0 + wy1) / 2, i, word, block_no, line_no)
+                      for i, (wx0, wy0, wx1, wy1, word, block_no, line_no, _)
+                      in enumerate(page.get_text("words"))), key=itemgetter(1))
+    ys = [c[1] for c in centres]
+    
+    # Scaled field rects as plain floats, with small padding (2px) to handle minor shifts
+    padding = 2
+    rects = [(f.x * scale_x - padding, f.y * scale_y - padding,
+              (f.x + f.width) * scale_x + padding, (f.y + f.height) * scale_y + padding)
+             for f in template.fields]
+    
+    values = []
+    for field, (x0, y0, x1, y1) in zip(template.fields, rects):
+        # Take words centred inside the rect, one output line per text line
+        band = centres[bisect_left(ys, y0):bisect_right(ys, y1)]
+        hits = sorted((c for c in band if x0 <= c[0] <= x1), key=itemgetter(2))  # Reading order
+        lines = {}
+        for _, _, _, word, block_no, line_no in hits:
+            lines.setdefault((block_no, line_no), []).append(word)
+        text = "\n".join(" ".join(line) for line in lines.values()).strip()
+        raw_text = text
+        
+        # SMART EXTRACTION:
+        # If the text starts with the field name (e.g. Field="Name", Text="Name: Varun"),
+        # strip the field name to get just the value.
+        m = field_name_pattern(field.name).match(text)
+        value = text[m.end():].strip() if m else ""
+        if value:
+            text = value
+        
+        if debug:
+            logger.debug("Field %s: stored (%.2f, %.2f, %.2f, %.2f), rect (%.2f, %.2f) -> (%.2f, %.2f), "
+                         "raw %r, value %r",
+                         field.name, field.x, field.y, field.width, field.height,
+                         x0, y0, x1, y1, raw_text, text)
+        values.append((field.name, text))
+    return values
+
+class ExtractSignals(QObject):
+    done = Signal(str, int, list)  # path, template id, [(field name, text)]
+    failed = Signal(str)
+
+class ExtractTask(QRunnable):
+    """Read a template's fields from page 1 of an open document on a pool thread"""
+    def __init__(self, doc, doc_lock, path, template_id, template):
+        super().__init__()
+        self.doc = doc
+        self.doc_lock = doc_lock
+        self.path = path
+        self.template_id = template_id
+        self.template = template
+        self.signals = ExtractSignals()
+    
+    def run(self):
+        try:
+            # MuPDF documents are not thread-safe: one user at a time
+            with self.doc_lock:
+                values = extract_field_values(self.doc.load_page(0), self.template)
+        except Exception as e:
+            logger.exception("Extraction failed")
+            self.signals.failed.emit(str(e))
+            return
+        self.signals.done.emit(self.path, self.template_id, values)
+
 class BoundingBox:
     def __init__(self, rect, name):
         self.rect = rect  # QRectF
         self.name = name
+        # Boxes never move once drawn; paint from these instead of converting per frame
+        self.draw_rect = rect.toRect()
+        self.label_pos = rect.topLeft().toPoint()
 
 class OCRTrainerModule(QWidget):
+    DOC_CACHE_SIZE = 4
+    CANVAS_SCALE = 1.5  # Enough pixel density to draw boxes; 2x cost ~78% more memory
+    
     def __init__(self):
         super().__init__()
         self.current_pdf = None
         self.current_image = None
         self.boxes = []
+        self.session = get_session()  # Reused by every template action
+        self.last_extraction = None  # (path, template_id) behind the result table
+        self._doc_cache = OrderedDict()  # (path, mtime) -> open fitz.Document
+        self.doc_lock = threading.Lock()  # Guards cached docs shared with ExtractTask
+        self._extract_tasks = set()
         self.setup_ui()
+        # A page of the main window's stack never gets closeEvent; clean up at quit
+        QApplication.instance().aboutToQuit.connect(self.release)
+    
+    def db_session(self):
+        """Return the module's session with stale objects expired"""
+        self.session.expire_all()
+        return self.session
+    
+    def open_cached(self, path):
+        """Return an open document for path, reusing it across extractions"""
+        import fitz
+        key = (os.path.abspath(path), os.path.getmtime(path))
+        doc = self._doc_cache.get(key)
+        if doc is not None:
+            self._doc_cache.move_to_end(key)
+            return doc
+        doc = fitz.open(path)
+        self._doc_cache[key] = doc
+        while len(self._doc_cache) > self.DOC_CACHE_SIZE:
+            evicted = self._doc_cache.popitem(last=False)[1]
+            with self.doc_lock:
+                evicted.close()
+        return doc
+    
+    def release(self):
+        """Close the long-lived session and the cached source documents"""
+        self.session.close()
+        # Open files can't be moved or deleted on Windows; let them go at quit
+        with self.doc_lock:
+            for doc in self._doc_cache.values():
+                doc.close()
+            self._doc_cache.clear()
     
     def setup_ui(self):
         layout = QHBoxLayout(self)
@@ -1381,6 +2264,11 @@ class OCRTrainerModule(QWidget):
         btn_extract.clicked.connect(self.run_extraction)
         left_panel.addWidget(btn_extract)
         
+        self.btn_preview = QPushButton("🖼️ Show Preview")
+        self.btn_preview.setEnabled(False)
+        self.btn_preview.clicked.connect(self.show_preview)
+        left_panel.addWidget(self.btn_preview)
+        
         self.result_table = QTableWidget(0, 2)
         self.result_table.setHorizontalHeaderLabels(["Field", "Value"])
         left_panel.addWidget(self.result_table)
@@ -1405,20 +2293,19 @@ class OCRTrainerModule(QWidget):
         path, _ = QFileDialog.getOpenFileName(self, "Open PDF", "", "PDF Files (*.pdf)")
         if path:
             try:
-                doc = fitz.open(path)
-                page = doc.load_page(0)
-                
-                # Store ACTUAL page dimensions (not zoomed)
-                self.actual_page_width = page.rect.width
-                self.actual_page_height = page.rect.height
-                
-                # Render at 2x for better display
-                pix = page.get_pixmap(matrix=fitz.Matrix(2, 2))
-                img = QImage(pix.samples, pix.width, pix.height, pix.stride, QImage.Format_RGB888)
-                self.current_image = QPixmap.fromImage(img)
-                self.canvas.set_image(self.current_image, scale_factor=2.0)
+                # Shared with run_extraction: extracting from the sample reuses the parse
+                doc = self.open_cached(path)
+                with self.doc_lock:
+                    page = doc.load_page(0)
+                    
+                    # Store ACTUAL page dimensions (not zoomed)
+                    self.actual_page_width = page.rect.width
+                    self.actual_page_height = page.rect.height
+                    
+                    # Render above 1x for better display; boxes are scaled back on save
+                    self.current_image = fitz_to_qpixmap(render_page_rgba(page, self.CANVAS_SCALE))
+                self.canvas.set_image(self.current_image, scale_factor=self.CANVAS_SCALE)
                 self.current_pdf = path
-                doc.close()
             except Exception as e:
                 QMessageBox.critical(self, "Error", str(e))
     
@@ -1428,7 +2315,7 @@ class OCRTrainerModule(QWidget):
             QMessageBox.warning(self, "Warning", "Enter name and draw boxes")
             return
         
-        session = SessionLocal()
+        session = self.db_session()
         
         # Check if template name already exists
         existing = session.query(Template).filter(Template.name == name).first()
@@ -1437,58 +2324,57 @@ class OCRTrainerModule(QWidget):
                                         f"Template '{name}' already exists. Overwrite?",
                                         QMessageBox.Yes | QMessageBox.No)
             if reply == QMessageBox.No:
-                session.close()
                 return
             else:
-                # Delete existing template (will cascade delete fields)
-                session.delete(existing)
-                session.commit()
+                # Drop the old template and its fields with two DELETEs instead of
+                # loading every field for the ORM cascade
+                session.execute(delete(Field).where(Field.template_id == existing.id))
+                session.execute(delete(Template).where(Template.id == existing.id))
         
         # Use ACTUAL page dimensions, not zoomed display dimensions
         template = Template(name=name, 
                           base_width=self.actual_page_width, 
                           base_height=self.actual_page_height)
         session.add(template)
-        session.commit()
-        
-        print("=" * 50)
-        print(f"SAVING TEMPLATE: {name}")
-        print(f"Base dimensions: {self.actual_page_width:.2f} x {self.actual_page_height:.2f}")
-        print(f"Scale factor: {self.canvas.scale_factor}")
-        print(f"Number of boxes: {len(self.canvas.boxes)}")
-        print("-" * 50)
-        
-        # Scale box coordinates back to original PDF size
-        for box in self.canvas.boxes:
-            scaled_x = box.rect.x() / self.canvas.scale_factor
-            scaled_y = box.rect.y() / self.canvas.scale_factor
-            scaled_w = box.rect.width() / self.canvas.scale_factor
-            scaled_h = box.rect.height() / self.canvas.scale_factor
-            
-            print(f"Box: {box.name}")
-            print(f"  Display coords: ({box.rect.x():.2f}, {box.rect.y():.2f}, {box.rect.width():.2f}, {box.rect.height():.2f})")
-            print(f"  Saved coords: ({scaled_x:.2f}, {scaled_y:.2f}, {scaled_w:.2f}, {scaled_h:.2f})")
-            
-            field = Field(template_id=template.id, name=box.name,
-                        x=scaled_x, y=scaled_y, 
-                        width=scaled_w, height=scaled_h)
-            session.add(field)
-        
-        session.commit()
-        session.close()
-        
-        print("=" * 50)
+        session.flush()  # Assigns template.id without committing
+        
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug("Saving template %s: base %.2f x %.2f, scale %s, %d boxes",
+                         name, self.actual_page_width, self.actual_page_height,
+                         self.canvas.scale_factor, len(self.canvas.boxes))
+        
+        # Scale all box coordinates back to original PDF size in one pass
+        inv = 1.0 / self.canvas.scale_factor
+        scaled = [c * inv for c in self.canvas.coords]
+        rows = [dict(template_id=template.id, name=box.name,
+                     x=scaled[j], y=scaled[j + 1],
+                     width=scaled[j + 2], height=scaled[j + 3])
+                for box, j in zip(self.canvas.boxes, range(0, len(scaled), 4))]
+        if debug:
+            for row in rows:
+                logger.debug("Field %(name)s saved at (%(x).2f, %(y).2f, %(width).2f, %(height).2f)", row)
+        
+        # One executemany INSERT instead of a unit-of-work entry per field;
+        # the overwrite, template and fields land in a single transaction
+        try:
+            if rows:
+                session.execute(insert(Field), rows)
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            QMessageBox.critical(self, "Error", str(e))
+            return
+        template_snapshot.cache_clear()
         
         QMessageBox.information(self, "Success", "Template saved!")
         self.load_templates()
     
     def load_templates(self):
         self.template_combo.clear()
-        session = SessionLocal()
-        templates = session.query(Template).all()
+        templates = self.db_session().query(Template).all()
         for t in templates:
             self.template_combo.addItem(t.name, t.id)
-        session.close()
     
     def run_extraction(self):
         if self.template_combo.count() == 0:
@@ -1499,167 +2385,156 @@ class OCRTrainerModule(QWidget):
             return
         
         template_id = self.template_combo.currentData()
-        session = SessionLocal()
-        template = session.query(Template).filter(Template.id == template_id).first()
-        
         try:
-            doc = fitz.open(path)
-            page = doc.load_page(0)
-            page_rect = page.rect
-            
-            # Print debug info
-            print("=" * 50)
-            print(f"EXTRACTION DEBUG")
-            print(f"Template: {template.name}")
-            print(f"Template base dimensions: {template.base_width:.2f} x {template.base_height:.2f}")
-            print(f"PDF page dimensions: {page_rect.width:.2f} x {page_rect.height:.2f}")
-            
-            scale_x = page_rect.width / template.base_width
-            scale_y = page_rect.height / template.base_height
-            
-            print(f"Scale factors: X={scale_x:.4f}, Y={scale_y:.4f}")
-            print(f"Number of fields: {len(template.fields)}")
-            print("-" * 50)
-            
-            self.result_table.setRowCount(len(template.fields))
-            
-            for i, field in enumerate(template.fields):
-                # Calculate scaled coordinates
-                x0 = field.x * scale_x
-                y0 = field.y * scale_y
-                x1 = (field.x + field.width) * scale_x
-                y1 = (field.y + field.height) * scale_y
-                
-                # Add small padding (2px) to handle minor shifts
-                padding = 2
-                rect = fitz.Rect(x0 - padding, y0 - padding, x1 + padding, y1 + padding)
-                
-                print(f"Field: {field.name}")
-                print(f"  Stored coords: ({field.x:.2f}, {field.y:.2f}, {field.width:.2f}, {field.height:.2f})")
-                print(f"  Scaled rect (w/ padding): ({rect.x0:.2f}, {rect.y0:.2f}) -> ({rect.x1:.2f}, {rect.y1:.2f})")
-                
-                # Try to extract text
-                text = page.get_text("text", clip=rect).strip()
-                
-                # If that doesn't work, try textbox method
-                if not text:
-                    text = page.get_textbox(rect).strip()
-                
-                print(f"  Raw extracted: '{text}'")
-                
-                # SMART EXTRACTION:
-                # If the text starts with the field name (e.g. Field="Name", Text="Name: Varun"),
-                # strip the field name to get just the value.
-                import re
-                # Pattern: Start of string, Field Name (case insensitive), optional colon/hyphen, whitespace
-                pattern = f"^{re.escape(field.name)}[:\\-\\s]*"
-                match = re.search(pattern, text, re.IGNORECASE)
-                if match:
-                    cleaned_text = re.sub(pattern, "", text, count=1, flags=re.IGNORECASE).strip()
-                    if cleaned_text:
-                        print(f"  Smart Cleaned: '{text}' -> '{cleaned_text}'")
-                        text = cleaned_text
-                
-                print(f"  Final Value: '{text}'")
-                print()
-                
-                self.result_table.setItem(i, 0, QTableWidgetItem(field.name))
+            template = template_snapshot(template_id)
+            doc = self.open_cached(path)
+        except Exception as e:
+            logger.exception("Extraction failed")
+            QMessageBox.critical(self, "Error", str(e))
+            return
+        
+        task = ExtractTask(doc, self.doc_lock, path, template_id, template)
+        task.signals.done.connect(lambda *_: self._extract_tasks.discard(task))
+        task.signals.failed.connect(lambda _: self._extract_tasks.discard(task))
+        task.signals.done.connect(self.on_extracted)
+        task.signals.failed.connect(lambda msg: QMessageBox.critical(self, "Error", msg))
+        self._extract_tasks.add(task)  # Keep the signals object alive until delivery
+        QThreadPool.globalInstance().start(task)
+    
+    def on_extracted(self, path, template_id, values):
+        with batch_updates(self.result_table):
+            self.result_table.setRowCount(len(values))
+            for i, (name, text) in enumerate(values):
+                self.result_table.setItem(i, 0, QTableWidgetItem(name))
                 self.result_table.setItem(i, 1, QTableWidgetItem(text))
-            
-            # Create a visual preview with rectangles drawn
-            pix = page.get_pixmap(matrix=fitz.Matrix(2, 2))
-            img = QImage(pix.samples, pix.width, pix.height, pix.stride, QImage.Format_RGB888)
-            preview_pixmap = QPixmap.fromImage(img)
-            
-            # Draw extraction rectangles on the preview using QPainter
-            from PySide6.QtGui import QPainter
-            painter = QPainter(preview_pixmap)
-            pen = QPen(QColor(255, 0, 0), 3)
-            painter.setPen(pen)
-            
-            for field in template.fields:
-                x0 = field.x * scale_x * 2
-                y0 = field.y * scale_y * 2
-                w = field.width * scale_x * 2
-                h = field.height * scale_y * 2
-                painter.drawRect(QRectF(x0, y0, w, h))
-            
-            painter.end()
-            
-            # Create a simple preview window
-            preview = QLabel()
-            preview.setPixmap(preview_pixmap)
-            preview.setWindowTitle("Extraction Preview (Red boxes show extraction areas)")
-            preview.show()
-            preview.setStyleSheet("background: black;")
-            
-            # Store reference to keep window alive
-            self.preview_window = preview
-            
-            doc.close()
-            
-            print("=" * 50)
-            QMessageBox.information(self, "Success", f"Extracted {len(template.fields)} fields!\nCheck the preview window to see extraction areas.")
-            
+        self.last_extraction = (path, template_id)
+        self.btn_preview.setEnabled(True)
+        
+        QMessageBox.information(self, "Success", f"Extracted {len(values)} fields!\nClick Show Preview to see extraction areas.")
+    
+    def show_preview(self):
+        """Render the last extracted page with its field boxes, on demand"""
+        if not self.last_extraction:
+            return
+        path, template_id = self.last_extraction
+        template = template_snapshot(template_id)
+        if template is None:
+            return
+        try:
+            doc = self.open_cached(path)
+            with self.doc_lock:
+                preview_pixmap = self.render_preview(doc.load_page(0), template)
         except Exception as e:
-            print(f"ERROR: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Preview failed")
             QMessageBox.critical(self, "Error", str(e))
-        finally:
-            session.close()
+            return
+        
+        # Create a simple preview window
+        preview = QLabel()
+        preview.setPixmap(preview_pixmap)
+        preview.setWindowTitle("Extraction Preview (Red boxes show extraction areas)")
+        preview.show()
+        preview.setStyleSheet("background: black;")
+        
+        # Store reference to keep window alive
+        self.preview_window = preview
+    
+    def render_preview(self, page, template):
+        """Page raster, no larger than the screen, with the template's boxes drawn on"""
+        page_rect = page.rect
+        screen = self.screen().availableGeometry()
+        scale = min(1.0, screen.height() / page_rect.height)
+        
+        # No alpha channel: the preview is opaque, RGB888 is a quarter smaller
+        pix = page.get_pixmap(matrix=zoom_matrix(scale), alpha=False)
+        # The QImage only borrows pix's samples; fromImage makes the single copy
+        preview_pixmap = fitz_to_qpixmap(pix)
+        pix = None
+        
+        # Draw extraction rectangles straight onto the QPixmap using QPainter
+        from PySide6.QtGui import QPainter
+        painter = QPainter(preview_pixmap)
+        pen = QPen(QColor(255, 0, 0), 3)
+        painter.setPen(pen)
+        
+        sx = page_rect.width / template.base_width * scale
+        sy = page_rect.height / template.base_height * scale
+        painter.drawRects([QRectF(f.x * sx, f.y * sy, f.width * sx, f.height * sy) for f in template.fields])
+        
+        painter.end()
+        return preview_pixmap
     
     def export_excel(self):
         if self.result_table.rowCount() == 0:
             return
         
-        path, _ = QFileDialog.getSaveFileName(self, "Save Excel", "", "Excel Files (*.xlsx)")
+        path, _ = QFileDialog.getSaveFileName(self, "Save Excel", "",
+                                              "Excel Files (*.xlsx);;CSV Files (*.csv)")
         if path:
-            data = []
-            for i in range(self.result_table.rowCount()):
-                data.append([
-                    self.result_table.item(i, 0).text(),
-                    self.result_table.item(i, 1).text()
-                ])
-            df = pd.DataFrame(data, columns=["Field", "Value"])
-            df.to_excel(path, index=False)
-            QMessageBox.information(self, "Success", "Exported to Excel!")
+            rows = [(self.result_table.item(i, 0).text(), self.result_table.item(i, 1).text())
+                    for i in range(self.result_table.rowCount())]
+            if path.lower().endswith(".csv"):
+                import csv
+                with open(path, "w", newline="", encoding="utf-8-sig") as f:
+                    writer = csv.writer(f)
+                    writer.writerow(["Field", "Value"])
+                    writer.writerows(rows)
+            else:
+                # Write-only workbooks stream rows out instead of building a cell grid
+                from openpyxl import Workbook
+                wb = Workbook(write_only=True)
+                ws = wb.create_sheet("Results")
+                ws.append(["Field", "Value"])
+                for row in rows:
+                    ws.append(row)
+                wb.save(path)
+            QMessageBox.information(self, "Success", f"Exported to {os.path.basename(path)}!")
 
 class CanvasWidget(QWidget):
     def __init__(self):
         super().__init__()
         self.pixmap = None
+        self.composed = None
         self.boxes = []
+        self.coords = array('d')  # x, y, w, h per box, parallel to self.boxes
         self.start_point = None
         self.current_rect = None
         self.scale_factor = 1.0
+        self.box_pen = QPen(QColor(255, 0, 0), 2)  # Saved boxes
+        self.rubber_pen = QPen(QColor(0, 0, 255), 2)  # Box being dragged
         self.setMinimumSize(400, 400)
     
     def set_image(self, pixmap, scale_factor=1.0):
         self.pixmap = pixmap
+        self.composed = QPixmap(pixmap)  # Page with saved boxes baked in; shares pixmap until drawn on
         self.boxes = []
+        self.coords = array('d')
         self.scale_factor = scale_factor
         self.setFixedSize(pixmap.size())
         self.update()
     
+    def bake_boxes(self, boxes):
+        """Draw saved boxes onto the composed pixmap once, not on every repaint"""
+        from PySide6.QtGui import QPainter
+        painter = QPainter(self.composed)
+        painter.setPen(self.box_pen)
+        painter.drawRects([box.draw_rect for box in boxes])
+        for box in boxes:
+            painter.drawText(box.label_pos, box.name)
+        painter.end()
+    
     def paintEvent(self, event):
         from PySide6.QtGui import QPainter
         if not self.pixmap:
             return
         
         painter = QPainter(self)
-        painter.drawPixmap(0, 0, self.pixmap)
-        
-        pen = QPen(QColor(255, 0, 0), 2)
-        painter.setPen(pen)
-        
-        for box in self.boxes:
-            painter.drawRect(box.rect.toRect())
-            painter.drawText(box.rect.topLeft().toPoint(), box.name)
+        # Only the dirty region: a drag repaints a strip, not the whole page
+        dirty = event.rect()
+        painter.drawPixmap(dirty, self.composed, dirty)
         
         if self.current_rect:
-            pen.setColor(QColor(0, 0, 255))
-            painter.setPen(pen)
+            painter.setPen(self.rubber_pen)
             painter.drawRect(self.current_rect.toRect())
     
     def mousePressEvent(self, event):
@@ -1668,15 +2543,22 @@ class CanvasWidget(QWidget):
     
     def mouseMoveEvent(self, event):
         if self.start_point:
+            previous = self.current_rect
             self.current_rect = QRectF(self.start_point, event.position()).normalized()
-            self.update()
+            # Repaint where the rubber band was and is now, plus the pen width
+            dirty = self.current_rect if previous is None else self.current_rect.united(previous)
+            self.update(dirty.toAlignedRect().adjusted(-2, -2, 2, 2))
     
     def mouseReleaseEvent(self, event):
         if self.current_rect:
             from PySide6.QtWidgets import QInputDialog
             name, ok = QInputDialog.getText(self, "Field Name", "Enter field name:")
             if ok and name:
-                self.boxes.append(BoundingBox(self.current_rect, name))
+                box = BoundingBox(self.current_rect, name)
+                self.boxes.append(box)
+                self.bake_boxes([box])
+                r = self.current_rect
+                self.coords.extend((r.x(), r.y(), r.width(), r.height()))
             self.current_rect = None
             self.start_point = None
             self.update()
@@ -1685,14 +2567,136 @@ class CanvasWidget(QWidget):
 # SCHEDULER MODULE
 # ============================================================================
 
+def run_python_script(path):
+    """Run a .py job inside a pool worker; returns its exit code"""
+    import runpy
+    import sys
+    from contextlib import redirect_stdout, redirect_stderr
+    # Match `python script.py`: argv, sys.path[0] and the cwd point at the script
+    script_dir = os.path.dirname(path)
+    saved_argv, saved_path, saved_cwd = sys.argv, sys.path[:], os.getcwd()
+    sys.argv = [path]
+    sys.path.insert(0, script_dir)
+    try:
+        os.chdir(script_dir)
+        # Output is never read; discard it rather than buffer it in memory
+        with open(os.devnull, "w") as sink, redirect_stdout(sink), redirect_stderr(sink):
+            runpy.run_path(path, run_name="__main__")
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except Exception:
+        return 1
+    finally:
+        os.chdir(saved_cwd)
+        sys.argv, sys.path[:] = saved_argv, saved_path
+        # Library imports stay loaded for the next run (the point of a warm worker);
+        # only the script's own sibling .py modules are forgotten, so another job's
+        # same-named helper isn't served from this one's folder
+        for name, module in list(sys.modules.items()):
+            file = getattr(module, "__file__", None) or ""
+            if file.endswith(".py") and os.path.dirname(os.path.abspath(file)) == script_dir:
+                del sys.modules[name]
+    return 0
+
+_script_pool = None  # Warm interpreters for .py jobs, started on first use
+
+def script_pool():
+    global _script_pool
+    if _script_pool is None:
+        import atexit
+        from concurrent.futures import ProcessPoolExecutor
+        _script_pool = ProcessPoolExecutor(max_workers=4)
+        atexit.register(_script_pool.shutdown)
+    return _script_pool
+
+def submit_python_script(path):
+    """Run a .py job on the pool, replacing the pool if a worker died under it"""
+    global _script_pool
+    from concurrent.futures.process import BrokenProcessPool
+    pool = script_pool()
+    try:
+        return pool.submit(run_python_script, path).result()
+    except BrokenProcessPool:
+        # A script that crashed or called os._exit breaks every later submit;
+        # start fresh workers so only this run fails
+        pool.shutdown(wait=False)
+        if _script_pool is pool:
+            _script_pool = None
+        logger.warning("Script pool broke while running %s; restarting it", path)
+        return 1
+
+class JobEvents(QObject):
+    finished = Signal(int)  # job id; emitted from scheduler threads, delivered on the GUI thread
+
+job_events = JobEvents()
+
+def run_scheduled_job(job_id):
+    """APScheduler entry point; module-level so the job store can persist a reference to it"""
+    # Read what the run needs and let the connection go before the script starts
+    with get_session() as session:
+        job = session.execute(select(Job.name, Job.script_path, Job.job_type)
+                              .where(Job.id == job_id)).first()
+    if job is None:
+        return
+    try:
+        script = job.script_path.strip().strip('"')
+        if script.lower().endswith(".py") and os.path.isfile(script):
+            # Python jobs reuse a pooled interpreter instead of paying startup per fire
+            returncode = submit_python_script(os.path.abspath(script))
+        else:
+            # Only the exit code is used, so the output is not piped back and held
+            returncode = subprocess.run(job.script_path, shell=True, stdin=subprocess.DEVNULL,
+                                        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL).returncode
+        # Routine runs are info (shown with --debug); a failing job is always reported
+        if returncode:
+            logger.warning("Job '%s' failed. Return code: %s", job.name, returncode)
+        else:
+            logger.info("Job '%s' executed. Return code: %s", job.name, returncode)
+        
+        # Run times are tracked by the job store; only a finished one-time job
+        # changes the Job row (APScheduler drops its trigger after firing)
+        if job.job_type == "one_time":
+            with get_session() as session:
+                session.execute(update(Job).where(Job.id == job_id).values(enabled=False))
+                session.commit()
+    except Exception:
+        logger.exception("Job %s failed", job_id)
+    job_events.finished.emit(job_id)
+
 class SchedulerModule(QWidget):
     def __init__(self):
         super().__init__()
-        self.scheduler = BackgroundScheduler()
-        self.scheduler.start()
+        self._scheduler = None
+        self._toggle_buttons = {}  # job id -> Enable/Disable button of its table row
         self.setup_ui()
+        job_events.finished.connect(lambda _: self.refresh_job_list())
         self.load_jobs_from_db()
-        self.check_missed_jobs()
+    
+    @property
+    def scheduler(self):
+        """APScheduler instance backed by the app database, created and started on first access"""
+        if self._scheduler is None:
+            import atexit
+            from apscheduler.schedulers.background import BackgroundScheduler
+            from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+            init_db()
+            # Triggers and next run times persist in the apscheduler_jobs table, so
+            # APScheduler itself replays missed runs (within each job's grace) on start
+            self._scheduler = BackgroundScheduler(
+                jobstores={"default": SQLAlchemyJobStore(engine=engine)},
+                job_defaults={"coalesce": True, "misfire_grace_time": 300})
+            self._scheduler.start()
+            atexit.register(self._scheduler.shutdown, wait=False)
+        return self._scheduler
+    
+    def unschedule(self, job_id):
+        """Remove a job from the APScheduler job store"""
+        if self._scheduler is None:
+            return  # Not started: no enabled job has been scheduled this session
+        try:
+            self.scheduler.remove_job(f"job_{job_id}")
+        except Exception:
+            pass
     
     def setup_ui(self):
         layout = QVBoxLayout(self)
@@ -1713,36 +2717,28 @@ class SchedulerModule(QWidget):
         layout.addWidget(self.job_table)
     
     def load_jobs_from_db(self):
-        """Load all jobs from database and add to scheduler"""
-        session = SessionLocal()
-        jobs = session.query(Job).all()
-        
-        for job_db in jobs:
-            if job_db.enabled:
-                self.schedule_job(job_db)
+        """Start the scheduler if any job is enabled and add those missing from its job store"""
+        session = get_session()
+        enabled = session.execute(select(Job).where(Job.enabled == True)).scalars().all()
+        
+        # Without an enabled job there is nothing to fire; the scheduler and its
+        # thread start when the first job is saved or enabled
+        if enabled:
+            # Persisted jobs resume on their own; only rows from before the job store
+            # existed (or whose schedule was lost) need a trigger built here
+            stored = {job.id for job in self.scheduler.get_jobs()}
+            for job_db in enabled:
+                if f"job_{job_db.id}" not in stored:
+                    self.schedule_job(job_db)
         
         session.close()
         self.refresh_job_list()
     
-    def check_missed_jobs(self):
-        """Check for and execute missed jobs on startup"""
-        session = SessionLocal()
-        now = datetime.datetime.now()
-        
-        jobs = session.query(Job).filter(Job.enabled == True, Job.next_run != None).all()
-        
-        for job_db in jobs:
-            if job_db.next_run < now:
-                # Job was missed
-                grace = datetime.timedelta(seconds=job_db.misfire_grace_time)
-                if now - job_db.next_run <= grace:
-                    print(f"Executing missed job: {job_db.name}")
-                    self.execute_job(job_db)
-        
-        session.close()
-    
     def schedule_job(self, job_db):
-        """Add job to APScheduler based on database record"""
+        """Add (or replace) the job's trigger in APScheduler"""
+        from apscheduler.triggers.cron import CronTrigger
+        from apscheduler.triggers.interval import IntervalTrigger
+        from apscheduler.triggers.date import DateTrigger
         job_id = f"job_{job_db.id}"
         
         try:
@@ -1765,60 +2761,19 @@ class SchedulerModule(QWidget):
             else:
                 return
             
+            # The job store pickles the call: a module function and the integer id
             self.scheduler.add_job(
-                lambda: self.execute_job_by_id(job_db.id),
+                run_scheduled_job,
                 trigger,
+                args=[job_db.id],
                 id=job_id,
                 name=job_db.name,
-                misfire_grace_time=job_db.misfire_grace_time
+                misfire_grace_time=job_db.misfire_grace_time,
+                replace_existing=True
             )
-            
-            # Update next_run in database
-            job = self.scheduler.get_job(job_id)
-            if job:
-                session = SessionLocal()
-                db_job = session.query(Job).get(job_db.id)
-                db_job.next_run = job.next_run_time
-                session.commit()
-                session.close()
                 
-        except Exception as e:
-            print(f"Error scheduling job {job_db.name}: {e}")
-    
-    def execute_job_by_id(self, job_id):
-        """Execute job by database ID"""
-        session = SessionLocal()
-        job_db = session.query(Job).get(job_id)
-        if job_db:
-            self.execute_job(job_db)
-        session.close()
-    
-    def execute_job(self, job_db):
-        """Execute the job script"""
-        try:
-            result = subprocess.run(job_db.script_path, shell=True, capture_output=True, text=True)
-            print(f"Job '{job_db.name}' executed. Return code: {result.returncode}")
-            
-            # Update last_run
-            session = SessionLocal()
-            db_job = session.query(Job).get(job_db.id)
-            db_job.last_run = datetime.datetime.now()
-            
-            # For one-time jobs, disable after execution
-            if job_db.job_type == "one_time":
-                db_job.enabled = False
-                # Remove from scheduler
-                try:
-                    self.scheduler.remove_job(f"job_{job_db.id}")
-                except:
-                    pass
-            
-            session.commit()
-            session.close()
-            self.refresh_job_list()
-            
-        except Exception as e:
-            print(f"Job '{job_db.name}' failed: {e}")
+        except Exception:
+            logger.exception("Error scheduling job %s", job_db.name)
     
     def add_job_dialog(self):
         """Enhanced dialog for adding jobs"""
@@ -2025,7 +2980,7 @@ class SchedulerModule(QWidget):
             QMessageBox.warning(self, "Warning", "Name and script path are required")
             return
         
-        session = SessionLocal()
+        session = get_session()
         
         job_db = Job()
         job_db.name = name
@@ -2035,7 +2990,6 @@ class SchedulerModule(QWidget):
         if is_onetime:
             job_db.job_type = "one_time"
             job_db.run_date = run_datetime
-            job_db.next_run = run_datetime
         else:
             job_db.job_type = "recurring"
             job_db.recurrence = rec_type.lower()
@@ -2053,9 +3007,8 @@ class SchedulerModule(QWidget):
                     job_db.day_of_month = day_of_month
         
         session.add(job_db)
+        # Commit before scheduling: the job store writes on its own connection
         session.commit()
-        
-        # Schedule the job
         self.schedule_job(job_db)
         
         session.close()
@@ -2063,58 +3016,85 @@ class SchedulerModule(QWidget):
         QMessageBox.information(self, "Success", "Job added successfully!")
     
     def refresh_job_list(self):
-        """Refresh the job table"""
-        session = SessionLocal()
-        jobs = session.query(Job).all()
-        
-        self.job_table.setRowCount(len(jobs))
-        
-        for row, job in enumerate(jobs):
-            self.job_table.setItem(row, 0, QTableWidgetItem(job.name))
-            
-            job_type_str = "One-Time" if job.job_type == "one_time" else f"Recurring ({job.recurrence})"
-            self.job_table.setItem(row, 1, QTableWidgetItem(job_type_str))
-            
-            next_run_str = job.next_run.strftime("%Y-%m-%d %H:%M") if job.next_run else "N/A"
-            self.job_table.setItem(row, 2, QTableWidgetItem(next_run_str))
-            
-            status_str = "Enabled" if job.enabled else "Disabled"
-            self.job_table.setItem(row, 3, QTableWidgetItem(status_str))
-            
-            # Actions
-            actions_widget = QWidget()
-            actions_layout = QHBoxLayout(actions_widget)
-            actions_layout.setContentsMargins(0, 0, 0, 0)
-            
-            btn_toggle = QPushButton("Disable" if job.enabled else "Enable")
-            btn_toggle.clicked.connect(lambda checked, j=job: self.toggle_job(j.id))
-            btn_delete = QPushButton("Delete")
-            btn_delete.clicked.connect(lambda checked, j=job: self.delete_job(j.id))
-            
-            actions_layout.addWidget(btn_toggle)
-            actions_layout.addWidget(btn_delete)
-            
-            self.job_table.setCellWidget(row, 4, actions_widget)
-        
+        """Refresh the job table, reusing the rows of jobs already shown"""
+        session = get_session()
+        # Plain tuples: the table only needs display columns, not Job objects
+        jobs = session.execute(
+            select(Job.id, Job.name, Job.job_type, Job.recurrence, Job.enabled)
+            .order_by(Job.id)
+        ).all()
         session.close()
+        # Next run times live with the triggers in the job store; listing them
+        # must not start a scheduler that has nothing to run
+        next_runs = {}
+        if self._scheduler is not None:
+            next_runs = {job.id: job.next_run_time for job in self._scheduler.get_jobs()}
+        
+        with batch_updates(self.job_table):
+            # Drop rows of deleted jobs, bottom-up so row indexes stay valid
+            live = {job.id for job in jobs}
+            for row in range(self.job_table.rowCount() - 1, -1, -1):
+                job_id = self.job_table.item(row, 0).data(Qt.UserRole)
+                if job_id not in live:
+                    self.job_table.removeRow(row)
+                    del self._toggle_buttons[job_id]
+            
+            # Remaining rows are in id order and new jobs have higher ids, so they append
+            for row, job in enumerate(jobs):
+                if row == self.job_table.rowCount():
+                    self.add_job_row(job.id)
+                
+                job_type_str = "One-Time" if job.job_type == "one_time" else f"Recurring ({job.recurrence})"
+                next_run = next_runs.get(f"job_{job.id}")
+                if self._scheduler is None:
+                    next_run_str = "-"
+                else:
+                    next_run_str = next_run.strftime("%Y-%m-%d %H:%M") if next_run else "N/A"
+                status_str = "Enabled" if job.enabled else "Disabled"
+                for col, text in enumerate((job.name, job_type_str, next_run_str, status_str)):
+                    self.job_table.item(row, col).setText(text)
+                self._toggle_buttons[job.id].setText("Disable" if job.enabled else "Enable")
+    
+    def add_job_row(self, job_id):
+        """Append an empty row with its action buttons for job_id"""
+        row = self.job_table.rowCount()
+        self.job_table.insertRow(row)
+        
+        name_item = QTableWidgetItem()
+        name_item.setData(Qt.UserRole, job_id)  # Row -> job id without a lookup table
+        self.job_table.setItem(row, 0, name_item)
+        for col in (1, 2, 3):
+            self.job_table.setItem(row, col, QTableWidgetItem())
+        
+        # Actions
+        actions_widget = QWidget()
+        actions_layout = QHBoxLayout(actions_widget)
+        actions_layout.setContentsMargins(0, 0, 0, 0)
+        
+        btn_toggle = QPushButton()
+        btn_toggle.clicked.connect(lambda checked: self.toggle_job(job_id))
+        btn_delete = QPushButton("Delete")
+        btn_delete.clicked.connect(lambda checked: self.delete_job(job_id))
+        
+        actions_layout.addWidget(btn_toggle)
+        actions_layout.addWidget(btn_delete)
+        
+        self.job_table.setCellWidget(row, 4, actions_widget)
+        self._toggle_buttons[job_id] = btn_toggle
     
     def toggle_job(self, job_id):
         """Enable or disable a job"""
-        session = SessionLocal()
-        job = session.query(Job).get(job_id)
+        session = get_session()
+        job = session.get(Job, job_id)
         
         if job:
             job.enabled = not job.enabled
             session.commit()
             
-            scheduler_job_id = f"job_{job_id}"
             if job.enabled:
                 self.schedule_job(job)
             else:
-                try:
-                    self.scheduler.remove_job(scheduler_job_id)
-                except:
-                    pass
+                self.unschedule(job_id)
         
         session.close()
         self.refresh_job_list()
@@ -2126,15 +3106,12 @@ class SchedulerModule(QWidget):
                                      QMessageBox.Yes | QMessageBox.No)
         
         if reply == QMessageBox.Yes:
-            session = SessionLocal()
-            job = session.query(Job).get(job_id)
+            session = get_session()
+            job = session.get(Job, job_id)
             
             if job:
                 # Remove from scheduler
-                try:
-                    self.scheduler.remove_job(f"job_{job_id}")
-                except:
-                    pass
+                self.unschedule(job_id)
                 
                 session.delete(job)
                 session.commit()
@@ -2249,7 +3226,8 @@ class MailDrafterModule(QWidget):
                         if not filename.lower().endswith(".pdf"):
                             filename += ".pdf"
                         save_path = os.path.join(folder_path, filename)
-                        tab.doc.save(save_path)
+                        with tab.doc_lock:
+                            tab.doc.save(save_path)
                         attachments.append(save_path)
             
             # 3. Create Outlook Item